@@ -7,8 +7,13 @@ Based on MDPI papers: Parkinson's tremor assessment with MPU6050 + ESP32
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import traceback
 import numpy as np
-from scipy.signal import butter, filtfilt, welch, hilbert, freqz
+import pandas as pd
+from scipy.signal import butter, welch, sosfreqz, get_window
+from scipy.fft import rfft, irfft, rfftfreq, next_fast_len, set_workers
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.gridspec import GridSpec
@@ -33,6 +38,15 @@ FREQ_TREMOR_HIGH = 12.0 # Upper bound
 # PSD parameters
 WINDOW_SEC = 4          # Welch window size (seconds)
 PSD_OVERLAP = 0.5       # 50% overlap
+FFT_PAD_SEC = 1.0       # Odd-extension padding around the FFT band-pass (s)
+FFT_WORKERS = -1        # scipy.fft threads for batched transforms (-1: all cores)
+
+# UI
+ANALYSIS_POLL_MS = 50   # How often the Tk loop checks the background analysis
+
+# CSV columns loaded (float32: MPU6050 has ~14-bit resolution, float64
+# would only double memory traffic)
+CSV_DTYPES = {'Timestamp': np.int64, 'Ax': np.float32, 'Ay': np.float32, 'Az': np.float32}
 
 # Tremor detection thresholds
 TREMOR_POWER_THRESHOLD = 0.01
@@ -46,6 +60,122 @@ COL_FILTERED = '#FF6347'    # Tomato - Filtered signal
 COL_X = '#E74C3C'           # Red - X axis
 COL_Y = '#808080'           # Gray - Y axis
 COL_Z = '#3498DB'           # Blue - Z axis
+ENVELOPE_MAX_POINTS = 4000  # Envelope lines are decimated to ~screen resolution
+
+# ==========================================
+# TREMOR FILTER (designed once at import)
+# ==========================================
+# Combined tremor filter (3-12 Hz) as second-order sections (b/a form is
+# ill-conditioned in fp32); applied as its filtfilt gain in the FFT domain
+SOS_TREMOR = butter(FILTER_ORDER, [FREQ_TREMOR_LOW, FREQ_TREMOR_HIGH],
+                    btype='band', fs=FS, output='sos').astype(np.float32)
+
+# Bode response of the fixed filter, shared by every file load
+BODE_FREQ, BODE_RESPONSE = sosfreqz(SOS_TREMOR, worN=4096, fs=FS)
+BODE_MAG_DB = 20*np.log10(np.abs(BODE_RESPONSE) + 1e-12)
+BODE_PHASE_DEG = np.unwrap(np.angle(BODE_RESPONSE)) * 180/np.pi
+
+# Clinical metrics panel (filled with str.format on each load)
+METRICS_TEMPLATE = """TREMOR CLASSIFICATION
+───────────────────────────────────
+Type: {tremor_type}
+Confidence: {confidence}
+
+ACCELEROMETER METRICS
+───────────────────────────────────
+Dominant Axis: {max_axis}
+Mean Amplitude:    {accel_mean:.4f} m/s²
+RMS:               {accel_rms:.4f} m/s²
+Max Amplitude:     {accel_max:.4f} m/s²
+
+TREMOR BAND ANALYSIS
+───────────────────────────────────
+Rest (3-7 Hz):
+  RMS:             {rest_rms:.4f} m/s²
+  Power:           {power_rest:.6f}
+
+Essential (6-12 Hz):
+  RMS:             {ess_rms:.4f} m/s²
+  Power:           {power_ess:.6f}
+
+Power Ratio:       {power_ratio:.2f}
+
+FREQUENCY
+───────────────────────────────────
+Dominant Freq:     {dominant_freq:.2f} Hz
+Peak Power:        {peak_power:.6f}
+"""
+
+# ==========================================
+# SIGNAL HELPERS
+# ==========================================
+@lru_cache(maxsize=8)
+def tremor_gain(nfft):
+    """|H(f)|^2 of SOS_TREMOR on the rfft grid of length nfft
+
+    Squared magnitude with zero phase is exactly what a forward-backward
+    (filtfilt) pass of the Butterworth filter applies.
+    """
+    _, h = sosfreqz(SOS_TREMOR, worN=rfftfreq(nfft, 1/FS), fs=FS)
+    gain = (np.abs(h)**2).astype(np.float32)
+    gain.flags.writeable = False
+    return gain
+
+def fft_bandpass(signals):
+    """Zero-phase tremor band-pass of stacked signals, plus their envelopes
+
+    The signals are odd-extended at both ends (as filtfilt does) to keep the
+    circular wrap-around away from the data, transformed together and
+    multiplied by the cached filtfilt gain. The amplitude envelope
+    |y + jH{y}| comes from the same filtered spectrum: H{y} is the spectrum
+    rotated by -j (DC and Nyquist zeroed), so no complex analytic signal or
+    second forward FFT is needed.
+    """
+    n = signals.shape[-1]
+    pad = min(int(FS * FFT_PAD_SEC), n - 1)
+    ext = np.concatenate([2*signals[..., :1] - signals[..., pad:0:-1], signals,
+                          2*signals[..., -1:] - signals[..., -2:-pad-2:-1]], axis=-1)
+    nfft = next_fast_len(ext.shape[-1], real=True)
+    spectrum = rfft(ext, nfft, axis=-1, workers=FFT_WORKERS) * tremor_gain(nfft)
+    filtered = irfft(spectrum, nfft, axis=-1, workers=FFT_WORKERS)[..., pad:pad + n]
+
+    spectrum[..., 0] = 0
+    if nfft % 2 == 0:
+        spectrum[..., -1] = 0
+    hilbert = irfft(-1j * spectrum, nfft, axis=-1, workers=FFT_WORKERS)[..., pad:pad + n]
+    return filtered, np.hypot(filtered, hilbert)
+
+@lru_cache(maxsize=8)
+def hann_window(n):
+    """Welch's default periodic Hann window, built once per segment length"""
+    window = get_window('hann', n)
+    window.flags.writeable = False
+    return window
+
+@lru_cache(maxsize=8)
+def band_slices(nfft):
+    """Rest, essential and tremor band slices on the Welch grid of length nfft
+
+    The bins are sorted, so each band is a contiguous slice found by binary
+    search (a view, no boolean mask copies); the grid depends only on nfft.
+    """
+    freq = rfftfreq(nfft, 1/FS)
+    def band(low, high):
+        return slice(np.searchsorted(freq, low), np.searchsorted(freq, high, side='right'))
+    return (band(FREQ_REST_LOW, FREQ_REST_HIGH),
+            band(FREQ_ESSENTIAL_LOW, FREQ_ESSENTIAL_HIGH),
+            band(FREQ_TREMOR_LOW, FREQ_TREMOR_HIGH))
+
+def rms(x):
+    """Root-mean-square along the last axis (one value per stacked row)
+
+    einsum fuses the square and the sum, so no x**2 temporary is created.
+    """
+    return np.sqrt(np.einsum('...n,...n->...', x, x) / x.shape[-1])
+
+def to_db(psd):
+    """Convert power to dB with a floor that keeps log10 finite"""
+    return 10*np.log10(psd + 1e-12)
 
 class TremorAnalyzerResearch:
     def __init__(self, root):
@@ -57,6 +187,14 @@ class TremorAnalyzerResearch:
         self.csv_path = None
         self.data = None
 
+        # Time-domain line artists (created on first analysis, then reused)
+        self.line_axis_raw = None
+        self.cursor = None
+
+        # Analysis runs on a worker thread so the Tk mainloop stays responsive
+        # (NumPy/SciPy FFT kernels release the GIL)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
         # Setup UI
         self.setup_style()
         self.setup_main_layout()
@@ -81,8 +219,9 @@ class TremorAnalyzerResearch:
         control_frame = ttk.Frame(self.root, padding="10")
         control_frame.pack(side=tk.TOP, fill=tk.X)
 
-        ttk.Button(control_frame, text="📂 Load CSV Data",
-                   command=self.load_and_process).pack(side=tk.LEFT, padx=10)
+        self.btn_load = ttk.Button(control_frame, text="📂 Load CSV Data",
+                                   command=self.load_and_process)
+        self.btn_load.pack(side=tk.LEFT, padx=10)
 
         self.lbl_file = ttk.Label(control_frame, text="No file loaded",
                                   font=("Arial", 9), foreground="gray")
@@ -159,9 +298,135 @@ class TremorAnalyzerResearch:
                    fontsize=10, color='gray')
             ax.set_xticks([])
             ax.set_yticks([])
+        self.line_axis_raw = None
 
         self.canvas.draw()
 
+    def create_filter_plots(self):
+        """Draw the fixed Bode plots and the metrics text artist once"""
+        # Bode Magnitude
+        self.ax_bode_mag.clear()
+        self.ax_bode_mag.plot(BODE_FREQ, BODE_MAG_DB, color='purple', linewidth=2)
+        self.ax_bode_mag.axvline(FREQ_TREMOR_LOW, color='red', linestyle=':', alpha=0.5, label=f'{FREQ_TREMOR_LOW} Hz')
+        self.ax_bode_mag.axvline(FREQ_TREMOR_HIGH, color='blue', linestyle=':', alpha=0.5, label=f'{FREQ_TREMOR_HIGH} Hz')
+        self.ax_bode_mag.axhline(-3, color='green', linestyle='--', alpha=0.5, label='-3 dB')
+
+        self.ax_bode_mag.set_title('Filter Magnitude Response (Butterworth Order 4)', fontweight='bold')
+        self.ax_bode_mag.set_xlabel('Frequency (Hz)')
+        self.ax_bode_mag.set_ylabel('Magnitude (dB)')
+        self.ax_bode_mag.set_xlim(0, 20)
+        self.ax_bode_mag.set_ylim(-60, 5)
+        self.ax_bode_mag.grid(True, alpha=0.3)
+        self.ax_bode_mag.legend(fontsize=8)
+
+        # Bode Phase
+        self.ax_bode_phase.clear()
+        self.ax_bode_phase.plot(BODE_FREQ, BODE_PHASE_DEG, color='purple', linewidth=2)
+        self.ax_bode_phase.axvline(FREQ_TREMOR_LOW, color='red', linestyle=':', alpha=0.5)
+        self.ax_bode_phase.axvline(FREQ_TREMOR_HIGH, color='blue', linestyle=':', alpha=0.5)
+
+        self.ax_bode_phase.set_title('Filter Phase Response', fontweight='bold')
+        self.ax_bode_phase.set_xlabel('Frequency (Hz)')
+        self.ax_bode_phase.set_ylabel('Phase (degrees)')
+        self.ax_bode_phase.set_xlim(0, 20)
+        self.ax_bode_phase.grid(True, alpha=0.3)
+
+        # Clinical Metrics Table
+        self.ax_metrics.clear()
+        self.ax_metrics.axis('off')
+        self.txt_metrics = self.ax_metrics.text(0.05, 0.95, '',
+                                               transform=self.ax_metrics.transAxes,
+                                               fontfamily='monospace', fontsize=8,
+                                               verticalalignment='top')
+        self.ax_metrics.set_title('Clinical Metrics (Research-Based)', fontweight='bold', loc='left')
+
+    def create_waveform_lines(self):
+        """Create the time-domain line artists of rows 2-3 once
+
+        Later loads only swap the data of these lines with set_data instead of
+        clearing every axis and rebuilding all artists from scratch.
+        """
+        for ax in [self.ax_axis_raw, self.ax_axis_filtered, self.ax_axis_overlay,
+                   self.ax_result_raw, self.ax_result_filtered, self.ax_result_overlay]:
+            ax.clear()
+            ax.set_xlabel('Time (s)')
+            ax.grid(True, alpha=0.3)
+            ax.margins(x=0)
+
+        # Row 2: dominant axis (colour follows the axis, set per load)
+        self.line_axis_raw, = self.ax_axis_raw.plot([], [], linewidth=0.8, alpha=0.7)
+        self.line_axis_filt, = self.ax_axis_filtered.plot([], [], linewidth=1.2)
+        self.line_axis_env_upper, = self.ax_axis_filtered.plot([], [], '--', alpha=0.4, linewidth=0.8)
+        self.line_axis_env_lower, = self.ax_axis_filtered.plot([], [], '--', alpha=0.4, linewidth=0.8)
+        self.line_axis_overlay_raw, = self.ax_axis_overlay.plot([], [], color=COL_RAW, linewidth=1,
+                                                                alpha=0.5, label='Raw')
+        self.line_axis_overlay_filt, = self.ax_axis_overlay.plot([], [], linewidth=1.5,
+                                                                 label='Filtered (3-12 Hz)')
+        self.ax_axis_overlay.legend(fontsize=8)
+
+        # Row 3: resultant vector
+        self.line_result_raw, = self.ax_result_raw.plot([], [], color=COL_RAW, linewidth=0.8, alpha=0.7)
+        self.line_result_filt, = self.ax_result_filtered.plot([], [], color=COL_FILTERED, linewidth=1.2)
+        self.line_result_env_upper, = self.ax_result_filtered.plot([], [], '--', color=COL_FILTERED,
+                                                                   alpha=0.4, linewidth=0.8)
+        self.line_result_env_lower, = self.ax_result_filtered.plot([], [], '--', color=COL_FILTERED,
+                                                                   alpha=0.4, linewidth=0.8)
+        self.line_result_overlay_raw, = self.ax_result_overlay.plot([], [], color=COL_RAW, linewidth=1,
+                                                                    alpha=0.5, label='Raw')
+        self.line_result_overlay_filt, = self.ax_result_overlay.plot([], [], color=COL_FILTERED,
+                                                                     linewidth=1.5, label='Filtered (3-12 Hz)')
+        self.ax_result_overlay.legend(fontsize=8)
+
+        self.ax_result_raw.set_ylabel('Magnitude (m/s²)')
+        self.ax_result_filtered.set_ylabel('Magnitude (m/s²)')
+        self.ax_result_overlay.set_ylabel('Magnitude (m/s²)')
+        self.ax_result_overlay.set_title('Resultant Vector: Raw vs Filtered', fontweight='bold')
+
+    def create_spectrum_plots(self):
+        """Create the PSD lines and band-power bars of row 4 once"""
+        for ax in [self.ax_psd_axis, self.ax_psd_all, self.ax_bands]:
+            ax.clear()
+
+        # PSD of dominant axis (filtered colour follows the axis, set per load)
+        self.line_psd_axis_raw, = self.ax_psd_axis.plot([], [], color=COL_RAW,
+                                                        linewidth=1, alpha=0.6, label='Raw')
+        self.line_psd_axis_filt, = self.ax_psd_axis.plot([], [], linewidth=1.5, label='Filtered')
+        self.ax_psd_axis.axvspan(FREQ_REST_LOW, FREQ_REST_HIGH,
+                                color=COL_REST, alpha=0.2, label='Rest (3-7 Hz)')
+        self.ax_psd_axis.axvspan(FREQ_ESSENTIAL_LOW, FREQ_ESSENTIAL_HIGH,
+                                color=COL_ESSENTIAL, alpha=0.2, label='Essential (6-12 Hz)')
+        self.line_psd_peak, = self.ax_psd_axis.plot([], [], 'o', color='red', markersize=8)
+
+        # PSD of resultant vector
+        self.line_psd_result_raw, = self.ax_psd_all.plot([], [], color=COL_RAW,
+                                                         linewidth=1, alpha=0.6, label='Raw')
+        self.line_psd_result_filt, = self.ax_psd_all.plot([], [], color=COL_FILTERED,
+                                                          linewidth=1.5, label='Filtered')
+        self.ax_psd_all.axvspan(FREQ_REST_LOW, FREQ_REST_HIGH,
+                               color=COL_REST, alpha=0.2, label='Rest (3-7 Hz)')
+        self.ax_psd_all.axvspan(FREQ_ESSENTIAL_LOW, FREQ_ESSENTIAL_HIGH,
+                               color=COL_ESSENTIAL, alpha=0.2, label='Essential (6-12 Hz)')
+        self.ax_psd_all.set_title('PSD - Resultant Vector', fontweight='bold')
+        self.ax_psd_all.legend(fontsize=7)
+
+        for ax in [self.ax_psd_axis, self.ax_psd_all]:
+            ax.set_xlabel('Frequency (Hz)')
+            ax.set_ylabel('Power (dB)')
+            ax.set_xlim(0, 20)
+            ax.grid(True, alpha=0.3)
+
+        # Tremor band power comparison (heights and value labels set per load)
+        bands = ['Rest\n(3-7 Hz)', 'Essential\n(6-12 Hz)']
+        colors = [COL_REST, COL_ESSENTIAL]
+        self.bars_bands = self.ax_bands.bar(bands, [0, 0], color=colors, alpha=0.7, edgecolor='black')
+        self.txt_bands = [self.ax_bands.text(bar.get_x() + bar.get_width()/2., 0, '',
+                                             ha='center', va='bottom', fontsize=9)
+                          for bar in self.bars_bands]
+
+        self.ax_bands.set_title('Tremor Band Power (Resultant)', fontweight='bold')
+        self.ax_bands.set_ylabel('Power (m²/s⁴)')
+        self.ax_bands.grid(True, alpha=0.3, axis='y')
+
     def load_and_process(self):
         """Load CSV file and process data"""
         # File dialog
@@ -176,165 +441,147 @@ class TremorAnalyzerResearch:
         self.csv_path = filepath
         self.lbl_file.config(text=f"File: {filepath.split('/')[-1]}")
         self.lbl_status.config(text="Processing...", foreground="blue")
-        self.root.update()
+        self.btn_load.config(state=tk.DISABLED)
 
-        try:
-            # Load data
-            self.data = self.load_csv_data(filepath)
+        # Load and process in the background, then poll for the result
+        future = self.executor.submit(self.compute_analysis, filepath)
+        self.root.after(ANALYSIS_POLL_MS, self.check_analysis, future)
+
+    def compute_analysis(self, filepath):
+        """Load and analyse a CSV file (worker thread: no Tk calls here)"""
+        data = self.load_csv_data(filepath)
+        return data, self.process_tremor_analysis(data)
 
-            # Process and visualize
-            self.process_tremor_analysis()
+    def check_analysis(self, future):
+        """Poll the background analysis and show its results on the Tk thread"""
+        if not future.done():
+            self.root.after(ANALYSIS_POLL_MS, self.check_analysis, future)
+            return
 
+        self.btn_load.config(state=tk.NORMAL)
+        try:
+            self.show_results(*future.result())
             self.lbl_status.config(text="✅ Analysis Complete", foreground="green")
 
-            # Enable interactive cursors
-            mplcursors.cursor(hover=True)
+            # Enable interactive cursors on the inspectable artists only
+            # (hover hit-testing every line and span is slow on the Pi)
+            if self.cursor is not None:
+                self.cursor.remove()
+            self.cursor = mplcursors.cursor([self.line_psd_axis_filt, self.line_psd_result_filt,
+                                             self.bars_bands], hover=True)
 
         except Exception as e:
             messagebox.showerror("Error", f"Processing failed:\n{str(e)}")
             self.lbl_status.config(text="❌ Error", foreground="red")
-            import traceback
             traceback.print_exc()
 
-    def load_csv_data(self, filepath):
-        """Load CSV data from file"""
-        data = {'Timestamp': [], 'Ax': [], 'Ay': [], 'Az': []}
+    def show_results(self, data, results):
+        """Update classification labels and plots (Tk thread)"""
+        self.data = data
+        metrics = results['metrics']
+        self.lbl_tremor_type.config(text=f"Type: {metrics['tremor_type']}",
+                                   foreground=metrics['color'])
+        self.lbl_confidence.config(text=f"Confidence: {metrics['confidence']}")
+        self.plot_analysis(**results)
 
+    def load_csv_data(self, filepath):
+        """Load CSV data from file (body parsed by pandas' C reader)"""
+        # Find header (metadata comment lines precede it)
+        header_idx = 0
         with open(filepath, 'r') as f:
-            lines = f.readlines()
-
-            # Find header
-            header_idx = 0
-            for i, line in enumerate(lines):
+            for i, line in enumerate(f):
                 if line.startswith('Timestamp,'):
                     header_idx = i
                     break
 
-            # Parse data
-            for line in lines[header_idx + 1:]:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-
-                try:
-                    parts = line.split(',')
-                    if len(parts) >= 4:  # Only need timestamp + Ax, Ay, Az
-                        data['Timestamp'].append(int(parts[0]))
-                        data['Ax'].append(float(parts[1]))
-                        data['Ay'].append(float(parts[2]))
-                        data['Az'].append(float(parts[3]))
-                except (ValueError, IndexError):
-                    continue
-
-        # Convert to numpy arrays
-        for key in data:
-            data[key] = np.array(data[key])
-
-        return data
-
-    def process_tremor_analysis(self):
-        """Main tremor analysis pipeline - Accelerometer focus"""
-
-        # Extract data
-        ax = self.data['Ax']
-        ay = self.data['Ay']
-        az = self.data['Az']
-        t = self.data['Timestamp'] / 1000.0  # Convert to seconds
-
-        # Remove DC offset per axis (gravity removal)
-        ax_clean = ax - np.mean(ax)
-        ay_clean = ay - np.mean(ay)
-        az_clean = az - np.mean(az)
-
-        # Find highest energy axis
-        energy_x = np.sum(ax_clean**2)
-        energy_y = np.sum(ay_clean**2)
-        energy_z = np.sum(az_clean**2)
-
-        energies = {'X': energy_x, 'Y': energy_y, 'Z': energy_z}
-        max_axis = max(energies, key=energies.get)
-
-        if max_axis == 'X':
-            dominant_axis = ax_clean
-            axis_color = COL_X
-        elif max_axis == 'Y':
-            dominant_axis = ay_clean
-            axis_color = COL_Y
-        else:
-            dominant_axis = az_clean
-            axis_color = COL_Z
+        # Only timestamp + Ax, Ay, Az are needed
+        read_args = dict(skiprows=header_idx + 1, header=None, names=list(CSV_DTYPES),
+                         usecols=range(len(CSV_DTYPES)), comment='#', engine='c')
+        try:
+            df = pd.read_csv(filepath, dtype=CSV_DTYPES, **read_args).dropna()
+        except ValueError:
+            # A corrupted field somewhere: parse loosely and drop the bad rows
+            df = pd.read_csv(filepath, **read_args).apply(pd.to_numeric, errors='coerce')
+            df = df.dropna().astype(CSV_DTYPES)
 
-        # Calculate resultant vector (magnitude)
-        accel_mag = np.sqrt(ax_clean**2 + ay_clean**2 + az_clean**2)
+        return {key: df[key].to_numpy() for key in CSV_DTYPES}
 
-        # Create filters
-        nyquist = 0.5 * FS
+    def process_tremor_analysis(self, data):
+        """Main tremor analysis pipeline - Accelerometer focus
 
-        # Combined tremor filter (3-12 Hz)
-        b_tremor, a_tremor = butter(FILTER_ORDER,
-                                    [FREQ_TREMOR_LOW/nyquist, FREQ_TREMOR_HIGH/nyquist],
-                                    btype='band')
+        Pure computation (safe on the worker thread); returns the keyword
+        arguments of plot_analysis.
+        """
 
-        # Rest tremor filter (3-7 Hz)
-        b_rest, a_rest = butter(FILTER_ORDER,
-                                [FREQ_REST_LOW/nyquist, FREQ_REST_HIGH/nyquist],
-                                btype='band')
+        # Extract data as a (3, N) matrix of X, Y, Z rows
+        accel = np.stack([data['Ax'], data['Ay'], data['Az']])
+        # Convert to seconds (float32 like the signals; ms stamps stay exact
+        # below 2^24, i.e. for recordings up to ~4.6 hours)
+        t = data['Timestamp'].astype(np.float32) / 1000
 
-        # Essential tremor filter (6-12 Hz)
-        b_ess, a_ess = butter(FILTER_ORDER,
-                              [FREQ_ESSENTIAL_LOW/nyquist, FREQ_ESSENTIAL_HIGH/nyquist],
-                              btype='band')
+        # Remove DC offset per axis (gravity removal)
+        accel -= accel.mean(axis=1, keepdims=True)
+        ax_clean, ay_clean, az_clean = accel
 
-        # Apply filters to dominant axis
-        axis_filtered = filtfilt(b_tremor, a_tremor, dominant_axis)
-        axis_rest = filtfilt(b_rest, a_rest, dominant_axis)
-        axis_ess = filtfilt(b_ess, a_ess, dominant_axis)
+        # Find highest energy axis
+        energies = np.einsum('ij,ij->i', accel, accel)
+        axis_idx = int(np.argmax(energies))
+        max_axis = 'XYZ'[axis_idx]
+        dominant_axis = accel[axis_idx]
+        axis_color = (COL_X, COL_Y, COL_Z)[axis_idx]
 
-        # Apply filters to resultant vector
-        result_filtered = filtfilt(b_tremor, a_tremor, accel_mag)
-        result_rest = filtfilt(b_rest, a_rest, accel_mag)
-        result_ess = filtfilt(b_ess, a_ess, accel_mag)
+        # Calculate resultant vector (magnitude)
+        accel_mag = np.sqrt(ax_clean**2 + ay_clean**2 + az_clean**2)
 
-        # Apply filters to all axes for multi-axis PSD
-        ax_filt = filtfilt(b_tremor, a_tremor, ax_clean)
-        ay_filt = filtfilt(b_tremor, a_tremor, ay_clean)
-        az_filt = filtfilt(b_tremor, a_tremor, az_clean)
+        # Apply tremor filter to dominant axis and resultant vector in one
+        # batched FFT over the stacked (2, N) signals
+        signals = np.stack([dominant_axis, accel_mag])
+        filtered, envelopes = fft_bandpass(signals)
+        axis_filtered, result_filtered = filtered
 
-        # Calculate PSDs
+        # Calculate PSDs. The Welch FFT length is snapped to a size pocketfft
+        # handles without a slow prime-factor path (the default 4 s window is
+        # 400 = 2^4 * 5^2 samples and is kept as-is)
         nperseg = min(len(accel_mag), int(FS * WINDOW_SEC))
         noverlap = int(nperseg * PSD_OVERLAP)
+        nfft = next_fast_len(nperseg, real=True)
+        window = hann_window(nperseg)
 
-        # PSD for dominant axis
-        f_axis, psd_axis_raw = welch(dominant_axis, FS, nperseg=nperseg, noverlap=noverlap)
-        _, psd_axis_filt = welch(axis_filtered, FS, nperseg=nperseg, noverlap=noverlap)
+        # PSD for dominant axis and resultant in one call on the (2, N) stack
+        # (its segment FFTs are spread over all cores)
+        with set_workers(FFT_WORKERS):
+            freq, psd_raw = welch(signals, FS, window=window, nperseg=nperseg, noverlap=noverlap, nfft=nfft, axis=-1)
+        psd_result_raw = psd_raw[1]
 
-        # PSD for all axes
-        f_x, psd_x = welch(ax_clean, FS, nperseg=nperseg, noverlap=noverlap)
-        f_y, psd_y = welch(ay_clean, FS, nperseg=nperseg, noverlap=noverlap)
-        f_z, psd_z = welch(az_clean, FS, nperseg=nperseg, noverlap=noverlap)
+        # Filtered spectra follow from the raw ones: the zero-phase band-pass
+        # scales power by |H(f)|^4, sampled on the same rfft grid
+        psd_filt = psd_raw * tremor_gain(nfft)**2
 
-        # PSD for resultant
-        f_result, psd_result_raw = welch(accel_mag, FS, nperseg=nperseg, noverlap=noverlap)
-        _, psd_result_filt = welch(result_filtered, FS, nperseg=nperseg, noverlap=noverlap)
+        # dB spectra shared by all PSD plots (log10 evaluated once per stack)
+        psd_axis_raw_db, psd_result_raw_db = to_db(psd_raw)
+        psd_axis_filt_db, psd_result_filt_db = to_db(psd_filt)
 
-        # Calculate metrics
+        # Calculate metrics (band powers and peak come from the raw resultant
+        # PSD above, so no separate spectrum is needed for classification)
         metrics = self.calculate_metrics(
-            accel_mag, result_filtered, result_rest, result_ess,
-            f_result, psd_result_raw, max_axis, axis_color
+            result_filtered, freq, psd_result_raw, band_slices(nfft), max_axis, axis_color
         )
 
-        # Visualize everything
-        self.plot_analysis(
-            t, dominant_axis, axis_filtered, accel_mag, result_filtered,
-            ax_clean, ay_clean, az_clean,
-            f_axis, psd_axis_raw, psd_axis_filt,
-            f_result, psd_result_raw, psd_result_filt,
-            b_tremor, a_tremor,
-            metrics, max_axis, axis_color
+        # RMS of dominant axis and resultant, raw and filtered: one row-wise
+        # reduction per stack
+        metrics['axis_raw_rms'], metrics['accel_raw_rms'] = rms(signals)
+        metrics['axis_filt_rms'], metrics['accel_rms'] = rms(filtered)
+
+        # Everything plot_analysis needs to visualize the result
+        return dict(
+            t=t, axis_raw=dominant_axis, axis_filt=axis_filtered,
+            result_raw=accel_mag, result_filt=result_filtered, envelopes=envelopes,
+            f_axis=freq, psd_axis_raw_db=psd_axis_raw_db, psd_axis_filt_db=psd_axis_filt_db,
+            f_result=freq, psd_result_raw_db=psd_result_raw_db, psd_result_filt_db=psd_result_filt_db,
+            metrics=metrics, max_axis=max_axis, axis_color=axis_color
         )
 
-    def calculate_metrics(self, accel_raw, accel_filt, accel_rest, accel_ess,
-                          freq, psd, max_axis, axis_color):
+    def calculate_metrics(self, accel_filt, freq, psd, bands, max_axis, axis_color):
         """Calculate tremor metrics"""
         metrics = {}
 
@@ -344,32 +591,31 @@ class TremorAnalyzerResearch:
 
         # Accelerometer features (using resultant vector)
         metrics['accel_mean'] = np.mean(accel_filt)
-        metrics['accel_rms'] = np.sqrt(np.mean(accel_filt**2))
         metrics['accel_max'] = np.max(np.abs(accel_filt))
 
-        # Band-specific RMS
-        metrics['rest_rms'] = np.sqrt(np.mean(accel_rest**2))
-        metrics['ess_rms'] = np.sqrt(np.mean(accel_ess**2))
+        # Power in frequency bands (cached slices of the Welch grid)
+        rest_band, ess_band, tremor_band = bands
+        metrics['band_power'] = np.array([psd[rest_band].sum(), psd[ess_band].sum()])
+        metrics['power_rest'], metrics['power_ess'] = metrics['band_power']
 
-        # Power in frequency bands
-        rest_mask = (freq >= FREQ_REST_LOW) & (freq <= FREQ_REST_HIGH)
-        ess_mask = (freq >= FREQ_ESSENTIAL_LOW) & (freq <= FREQ_ESSENTIAL_HIGH)
-
-        metrics['power_rest'] = np.sum(psd[rest_mask])
-        metrics['power_ess'] = np.sum(psd[ess_mask])
+        # Band-specific RMS straight from the PSD (Parseval: RMS^2 is the
+        # PSD integrated over the band), no band-pass filtering needed
+        df = freq[1] - freq[0]
+        metrics['rest_rms'], metrics['ess_rms'] = np.sqrt(metrics['band_power'] * df)
 
         # Dominant frequency
-        tremor_mask = (freq >= 3) & (freq <= 12)
-        if np.sum(tremor_mask) > 0:
-            peak_idx = np.argmax(psd[tremor_mask])
-            metrics['dominant_freq'] = freq[tremor_mask][peak_idx]
-            metrics['peak_power'] = psd[tremor_mask][peak_idx]
+        if tremor_band.stop > tremor_band.start:
+            peak_idx = tremor_band.start + np.argmax(psd[tremor_band])
+            metrics['dominant_freq'] = freq[peak_idx]
+            metrics['peak_power'] = psd[peak_idx]
         else:
             metrics['dominant_freq'] = 0
             metrics['peak_power'] = 0
+        metrics['peak_power_db'] = to_db(metrics['peak_power'])
 
         # Classification
         power_ratio = metrics['power_rest'] / (metrics['power_ess'] + 1e-10)
+        metrics['power_ratio'] = power_ratio
 
         if metrics['power_rest'] < TREMOR_POWER_THRESHOLD and \
            metrics['power_ess'] < TREMOR_POWER_THRESHOLD:
@@ -389,256 +635,128 @@ class TremorAnalyzerResearch:
             metrics['confidence'] = f"Moderate (ratio: {power_ratio:.2f})"
             metrics['color'] = COL_REST
 
-        # Update UI
-        self.lbl_tremor_type.config(text=f"Type: {metrics['tremor_type']}",
-                                   foreground=metrics['color'])
-        self.lbl_confidence.config(text=f"Confidence: {metrics['confidence']}")
-
         return metrics
 
-    def plot_analysis(self, t, axis_raw, axis_filt, result_raw, result_filt,
-                     ax, ay, az, f_axis, psd_axis_raw, psd_axis_filt,
-                     f_result, psd_result_raw, psd_result_filt,
-                     b_tremor, a_tremor, metrics, max_axis, axis_color):
+    def plot_analysis(self, t, axis_raw, axis_filt, result_raw, result_filt, envelopes,
+                     f_axis, psd_axis_raw_db, psd_axis_filt_db,
+                     f_result, psd_result_raw_db, psd_result_filt_db,
+                     metrics, max_axis, axis_color):
         """Plot complete analysis"""
 
         # ============================================================
         # ROW 1: FILTER CHARACTERISTICS
         # ============================================================
 
-        # Bode Magnitude
-        self.ax_bode_mag.clear()
-        w, h = freqz(b_tremor, a_tremor, worN=4096, fs=FS)
-
-        self.ax_bode_mag.plot(w, 20*np.log10(abs(h)), color='purple', linewidth=2)
-        self.ax_bode_mag.axvline(FREQ_TREMOR_LOW, color='red', linestyle=':', alpha=0.5, label=f'{FREQ_TREMOR_LOW} Hz')
-        self.ax_bode_mag.axvline(FREQ_TREMOR_HIGH, color='blue', linestyle=':', alpha=0.5, label=f'{FREQ_TREMOR_HIGH} Hz')
-        self.ax_bode_mag.axhline(-3, color='green', linestyle='--', alpha=0.5, label='-3 dB')
-
-        self.ax_bode_mag.set_title('Filter Magnitude Response (Butterworth Order 4)', fontweight='bold')
-        self.ax_bode_mag.set_xlabel('Frequency (Hz)')
-        self.ax_bode_mag.set_ylabel('Magnitude (dB)')
-        self.ax_bode_mag.set_xlim(0, 20)
-        self.ax_bode_mag.set_ylim(-60, 5)
-        self.ax_bode_mag.grid(True, alpha=0.3)
-        self.ax_bode_mag.legend(fontsize=8)
-
-        # Bode Phase
-        self.ax_bode_phase.clear()
-        self.ax_bode_phase.plot(w, np.unwrap(np.angle(h)) * 180/np.pi,
-                               color='purple', linewidth=2)
-        self.ax_bode_phase.axvline(FREQ_TREMOR_LOW, color='red', linestyle=':', alpha=0.5)
-        self.ax_bode_phase.axvline(FREQ_TREMOR_HIGH, color='blue', linestyle=':', alpha=0.5)
+        if self.line_axis_raw is None:
+            self.create_filter_plots()
+            self.create_waveform_lines()
+            self.create_spectrum_plots()
 
-        self.ax_bode_phase.set_title('Filter Phase Response', fontweight='bold')
-        self.ax_bode_phase.set_xlabel('Frequency (Hz)')
-        self.ax_bode_phase.set_ylabel('Phase (degrees)')
-        self.ax_bode_phase.set_xlim(0, 20)
-        self.ax_bode_phase.grid(True, alpha=0.3)
-
-        # Clinical Metrics Table
-        self.ax_metrics.clear()
-        self.ax_metrics.axis('off')
-
-        metrics_text = f"""TREMOR CLASSIFICATION
-{'─'*35}
-Type: {metrics['tremor_type']}
-Confidence: {metrics['confidence']}
-
-ACCELEROMETER METRICS
-{'─'*35}
-Dominant Axis: {metrics['max_axis']}
-Mean Amplitude:    {metrics['accel_mean']:.4f} m/s²
-RMS:               {metrics['accel_rms']:.4f} m/s²
-Max Amplitude:     {metrics['accel_max']:.4f} m/s²
-
-TREMOR BAND ANALYSIS
-{'─'*35}
-Rest (3-7 Hz):
-  RMS:             {metrics['rest_rms']:.4f} m/s²
-  Power:           {metrics['power_rest']:.6f}
-
-Essential (6-12 Hz):
-  RMS:             {metrics['ess_rms']:.4f} m/s²
-  Power:           {metrics['power_ess']:.6f}
-
-Power Ratio:       {metrics['power_rest']/(metrics['power_ess']+1e-10):.2f}
-
-FREQUENCY
-{'─'*35}
-Dominant Freq:     {metrics['dominant_freq']:.2f} Hz
-Peak Power:        {metrics['peak_power']:.6f}
-"""
-
-        self.ax_metrics.text(0.05, 0.95, metrics_text,
-                            transform=self.ax_metrics.transAxes,
-                            fontfamily='monospace', fontsize=8,
-                            verticalalignment='top')
-        self.ax_metrics.set_title('Clinical Metrics (Research-Based)', fontweight='bold', loc='left')
+        # Bode plots are fixed (module-level response); only the metrics
+        # text changes per load
+        self.txt_metrics.set_text(METRICS_TEMPLATE.format(**metrics))
 
         # ============================================================
         # ROW 2: HIGHEST ENERGY AXIS ANALYSIS
         # ============================================================
 
         # Raw signal
-        self.ax_axis_raw.clear()
-        self.ax_axis_raw.plot(t, axis_raw, color=axis_color, linewidth=0.8, alpha=0.7)
-        self.ax_axis_raw.set_title(f'{max_axis}-Axis (Highest Energy) - Raw | RMS: {np.sqrt(np.mean(axis_raw**2)):.4f} m/s²',
+        self.line_axis_raw.set_data(t, axis_raw)
+        self.line_axis_raw.set_color(axis_color)
+        self.ax_axis_raw.set_title(f'{max_axis}-Axis (Highest Energy) - Raw | RMS: {metrics["axis_raw_rms"]:.4f} m/s²',
                                   fontweight='bold')
-        self.ax_axis_raw.set_ylabel(f'{max_axis} (m/s²)')
-        self.ax_axis_raw.set_xlabel('Time (s)')
-        self.ax_axis_raw.grid(True, alpha=0.3)
-        self.ax_axis_raw.margins(x=0)
 
         # Filtered signal
-        self.ax_axis_filtered.clear()
-        self.ax_axis_filtered.plot(t, axis_filt, color=axis_color, linewidth=1.2)
-
-        # Add envelope
-        envelope = np.abs(hilbert(axis_filt))
-        self.ax_axis_filtered.plot(t, envelope, '--', color=axis_color, alpha=0.4, linewidth=0.8)
-        self.ax_axis_filtered.plot(t, -envelope, '--', color=axis_color, alpha=0.4, linewidth=0.8)
-
-        self.ax_axis_filtered.set_title(f'{max_axis}-Axis Filtered (3-12 Hz) | RMS: {np.sqrt(np.mean(axis_filt**2)):.4f} m/s²',
+        self.line_axis_filt.set_data(t, axis_filt)
+
+        # Add envelope (smooth, so only every env_step-th sample is drawn)
+        env_step = max(1, len(t) // ENVELOPE_MAX_POINTS)
+        t_env = t[::env_step]
+        envelope, envelope_result = envelopes[:, ::env_step]
+        self.line_axis_env_upper.set_data(t_env, envelope)
+        self.line_axis_env_lower.set_data(t_env, -envelope)
+        for line in (self.line_axis_filt, self.line_axis_env_upper, self.line_axis_env_lower):
+            line.set_color(axis_color)
+
+        self.ax_axis_filtered.set_title(f'{max_axis}-Axis Filtered (3-12 Hz) | RMS: {metrics["axis_filt_rms"]:.4f} m/s²',
                                        fontweight='bold')
-        self.ax_axis_filtered.set_ylabel(f'{max_axis} (m/s²)')
-        self.ax_axis_filtered.set_xlabel('Time (s)')
-        self.ax_axis_filtered.grid(True, alpha=0.3)
-        self.ax_axis_filtered.margins(x=0)
 
         # Overlay comparison
-        self.ax_axis_overlay.clear()
-        self.ax_axis_overlay.plot(t, axis_raw, color=COL_RAW, linewidth=1,
-                                 alpha=0.5, label='Raw')
-        self.ax_axis_overlay.plot(t, axis_filt, color=axis_color, linewidth=1.5,
-                                 label='Filtered (3-12 Hz)')
-
+        self.line_axis_overlay_raw.set_data(t, axis_raw)
+        self.line_axis_overlay_filt.set_data(t, axis_filt)
+        self.line_axis_overlay_filt.set_color(axis_color)
         self.ax_axis_overlay.set_title(f'{max_axis}-Axis: Raw vs Filtered', fontweight='bold')
-        self.ax_axis_overlay.set_ylabel(f'{max_axis} (m/s²)')
-        self.ax_axis_overlay.set_xlabel('Time (s)')
-        self.ax_axis_overlay.grid(True, alpha=0.3)
-        self.ax_axis_overlay.margins(x=0)
-        self.ax_axis_overlay.legend(fontsize=8)
+
+        for axis in (self.ax_axis_raw, self.ax_axis_filtered, self.ax_axis_overlay):
+            axis.set_ylabel(f'{max_axis} (m/s²)')
 
         # ============================================================
         # ROW 3: RESULTANT VECTOR ANALYSIS
         # ============================================================
 
         # Raw resultant
-        self.ax_result_raw.clear()
-        self.ax_result_raw.plot(t, result_raw, color=COL_RAW, linewidth=0.8, alpha=0.7)
-        self.ax_result_raw.set_title(f'Resultant Vector (Raw) | RMS: {np.sqrt(np.mean(result_raw**2)):.4f} m/s²',
+        self.line_result_raw.set_data(t, result_raw)
+        self.ax_result_raw.set_title(f'Resultant Vector (Raw) | RMS: {metrics["accel_raw_rms"]:.4f} m/s²',
                                     fontweight='bold')
-        self.ax_result_raw.set_ylabel('Magnitude (m/s²)')
-        self.ax_result_raw.set_xlabel('Time (s)')
-        self.ax_result_raw.grid(True, alpha=0.3)
-        self.ax_result_raw.margins(x=0)
 
         # Filtered resultant
-        self.ax_result_filtered.clear()
-        self.ax_result_filtered.plot(t, result_filt, color=COL_FILTERED, linewidth=1.2)
+        self.line_result_filt.set_data(t, result_filt)
 
         # Add envelope
-        envelope_result = np.abs(hilbert(result_filt))
-        self.ax_result_filtered.plot(t, envelope_result, '--', color=COL_FILTERED, alpha=0.4, linewidth=0.8)
-        self.ax_result_filtered.plot(t, -envelope_result, '--', color=COL_FILTERED, alpha=0.4, linewidth=0.8)
+        self.line_result_env_upper.set_data(t_env, envelope_result)
+        self.line_result_env_lower.set_data(t_env, -envelope_result)
 
         self.ax_result_filtered.set_title(f'Resultant Filtered (3-12 Hz) | RMS: {metrics["accel_rms"]:.4f} m/s²',
                                          fontweight='bold')
-        self.ax_result_filtered.set_ylabel('Magnitude (m/s²)')
-        self.ax_result_filtered.set_xlabel('Time (s)')
-        self.ax_result_filtered.grid(True, alpha=0.3)
-        self.ax_result_filtered.margins(x=0)
 
         # Overlay comparison
-        self.ax_result_overlay.clear()
-        self.ax_result_overlay.plot(t, result_raw, color=COL_RAW, linewidth=1,
-                                   alpha=0.5, label='Raw')
-        self.ax_result_overlay.plot(t, result_filt, color=COL_FILTERED, linewidth=1.5,
-                                   label='Filtered (3-12 Hz)')
+        self.line_result_overlay_raw.set_data(t, result_raw)
+        self.line_result_overlay_filt.set_data(t, result_filt)
 
-        self.ax_result_overlay.set_title('Resultant Vector: Raw vs Filtered', fontweight='bold')
-        self.ax_result_overlay.set_ylabel('Magnitude (m/s²)')
-        self.ax_result_overlay.set_xlabel('Time (s)')
-        self.ax_result_overlay.grid(True, alpha=0.3)
-        self.ax_result_overlay.margins(x=0)
-        self.ax_result_overlay.legend(fontsize=8)
+        # Rescale the reused axes to the new data
+        for axis in (self.ax_axis_raw, self.ax_axis_filtered, self.ax_axis_overlay,
+                     self.ax_result_raw, self.ax_result_filtered, self.ax_result_overlay):
+            axis.relim()
+            axis.autoscale_view()
 
         # ============================================================
         # ROW 4: PSD ANALYSIS
         # ============================================================
 
         # PSD of dominant axis
-        self.ax_psd_axis.clear()
-        psd_raw_db = 10*np.log10(psd_axis_raw + 1e-12)
-        psd_filt_db = 10*np.log10(psd_axis_filt + 1e-12)
-
-        self.ax_psd_axis.plot(f_axis, psd_raw_db, color=COL_RAW,
-                             linewidth=1, alpha=0.6, label='Raw')
-        self.ax_psd_axis.plot(f_axis, psd_filt_db, color=axis_color,
-                             linewidth=1.5, label='Filtered')
-
-        self.ax_psd_axis.axvspan(FREQ_REST_LOW, FREQ_REST_HIGH,
-                                color=COL_REST, alpha=0.2, label='Rest (3-7 Hz)')
-        self.ax_psd_axis.axvspan(FREQ_ESSENTIAL_LOW, FREQ_ESSENTIAL_HIGH,
-                                color=COL_ESSENTIAL, alpha=0.2, label='Essential (6-12 Hz)')
+        self.line_psd_axis_raw.set_data(f_axis, psd_axis_raw_db)
+        self.line_psd_axis_filt.set_data(f_axis, psd_axis_filt_db)
+        self.line_psd_axis_filt.set_color(axis_color)
 
         # Mark dominant frequency
         if metrics['dominant_freq'] > 0:
-            dom_psd_db = 10*np.log10(metrics['peak_power'] + 1e-12)
-            self.ax_psd_axis.plot(metrics['dominant_freq'], dom_psd_db, 'o',
-                                 color='red', markersize=8,
-                                 label=f"Peak: {metrics['dominant_freq']:.2f} Hz")
+            self.line_psd_peak.set_data([metrics['dominant_freq']], [metrics['peak_power_db']])
+            self.line_psd_peak.set_label(f"Peak: {metrics['dominant_freq']:.2f} Hz")
+            self.line_psd_peak.set_visible(True)
+        else:
+            self.line_psd_peak.set_label('_nolegend_')
+            self.line_psd_peak.set_visible(False)
 
         self.ax_psd_axis.set_title(f'PSD - {max_axis} Axis', fontweight='bold')
-        self.ax_psd_axis.set_xlabel('Frequency (Hz)')
-        self.ax_psd_axis.set_ylabel('Power (dB)')
-        self.ax_psd_axis.set_xlim(0, 20)
-        self.ax_psd_axis.grid(True, alpha=0.3)
         self.ax_psd_axis.legend(fontsize=7)
 
         # PSD of resultant vector
-        self.ax_psd_all.clear()
-        psd_result_raw_db = 10*np.log10(psd_result_raw + 1e-12)
-        psd_result_filt_db = 10*np.log10(psd_result_filt + 1e-12)
-
-        self.ax_psd_all.plot(f_result, psd_result_raw_db, color=COL_RAW,
-                            linewidth=1, alpha=0.6, label='Raw')
-        self.ax_psd_all.plot(f_result, psd_result_filt_db, color=COL_FILTERED,
-                            linewidth=1.5, label='Filtered')
+        self.line_psd_result_raw.set_data(f_result, psd_result_raw_db)
+        self.line_psd_result_filt.set_data(f_result, psd_result_filt_db)
 
-        self.ax_psd_all.axvspan(FREQ_REST_LOW, FREQ_REST_HIGH,
-                               color=COL_REST, alpha=0.2, label='Rest (3-7 Hz)')
-        self.ax_psd_all.axvspan(FREQ_ESSENTIAL_LOW, FREQ_ESSENTIAL_HIGH,
-                               color=COL_ESSENTIAL, alpha=0.2, label='Essential (6-12 Hz)')
-
-        self.ax_psd_all.set_title('PSD - Resultant Vector', fontweight='bold')
-        self.ax_psd_all.set_xlabel('Frequency (Hz)')
-        self.ax_psd_all.set_ylabel('Power (dB)')
-        self.ax_psd_all.set_xlim(0, 20)
-        self.ax_psd_all.grid(True, alpha=0.3)
-        self.ax_psd_all.legend(fontsize=7)
+        for axis in (self.ax_psd_axis, self.ax_psd_all):
+            axis.relim()
+            axis.autoscale_view()
 
         # Tremor band power comparison
-        self.ax_bands.clear()
-        bands = ['Rest\n(3-7 Hz)', 'Essential\n(6-12 Hz)']
-        powers = [metrics['power_rest'], metrics['power_ess']]
-        colors = [COL_REST, COL_ESSENTIAL]
-
-        bars = self.ax_bands.bar(bands, powers, color=colors, alpha=0.7, edgecolor='black')
-
-        # Add value labels on bars
-        for bar, power in zip(bars, powers):
-            height = bar.get_height()
-            self.ax_bands.text(bar.get_x() + bar.get_width()/2., height,
-                              f'{power:.4f}',
-                              ha='center', va='bottom', fontsize=9)
-
-        self.ax_bands.set_title('Tremor Band Power (Resultant)', fontweight='bold')
-        self.ax_bands.set_ylabel('Power (m²/s⁴)')
-        self.ax_bands.grid(True, alpha=0.3, axis='y')
-
-        self.canvas.draw()
+        for bar, label, power in zip(self.bars_bands, self.txt_bands, metrics['band_power']):
+            bar.set_height(power)
+            label.set_y(power)
+            label.set_text(f'{power:.4f}')
+        self.ax_bands.relim()
+        self.ax_bands.autoscale_view()
+
+        self.canvas.draw_idle()
 
         # Print to console
         print("\n" + "="*70)
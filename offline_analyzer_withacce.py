@@ -2,7 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
 import numpy as np
-from scipy.signal import butter, filtfilt, welch, freqz
+from scipy.signal import butter, sosfiltfilt, welch, sosfreqz, get_window
+from scipy.fft import rfft, rfftfreq, next_fast_len, set_workers
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import mplcursors
@@ -36,6 +37,41 @@ CUTOFF_LOW = 3.0    # 3Hz - 20Hz Bandpass
 CUTOFF_HIGH = 20.0  
 FILTER_ORDER = 4
 WINDOW_SEC = 4      
+HIST_BINS = np.arange(0, 16, 1)  # Tremor-stability histogram bin edges (Hz)
+SENSOR_COLS = ['ax', 'ay', 'az', 'gx', 'gy', 'gz']
+FFT_WORKERS = -1    # scipy.fft threads for batched transforms (-1: all cores)
+
+# ==========================================
+# 3. SIGNAL HELPERS
+# ==========================================
+def filter_response(sos):
+    """ Bode data (freq, magnitude dB, phase deg) of an SOS filter """
+    w, h = sosfreqz(sos, worN=4096, fs=FS)
+    return w, 20 * np.log10(np.abs(h) + 1e-12), np.degrees(np.unwrap(np.angle(h)))
+
+# Band-pass shared by both sensors and every load - designed (and its Bode
+# data computed) once at import
+SOS_BANDPASS = butter(FILTER_ORDER, [CUTOFF_LOW, CUTOFF_HIGH], btype='band', fs=FS, output='sos')
+BODE_FREQ, BODE_MAG_DB, BODE_PHASE_DEG = filter_response(SOS_BANDPASS)
+
+def sliding_peak_freqs(x, winsize, step, min_power):
+    """ Peak frequency of every sliding window, all windows in one batched FFT.
+    Same result as a single-segment welch() per window (constant detrend,
+    periodic Hann, one-sided density); windows whose peak PSD does not exceed
+    min_power are dropped. """
+    starts = np.arange(0, len(x) - winsize, step)
+    if len(starts) == 0:
+        return np.empty(0)
+    segs = np.lib.stride_tricks.sliding_window_view(np.asarray(x), winsize)[starts]
+    segs = segs - segs.mean(axis=1, keepdims=True)
+
+    win = get_window('hann', winsize)
+    psd = np.abs(rfft(segs * win, axis=1, workers=FFT_WORKERS))**2 / (FS * np.sum(win**2))
+    psd[:, 1:(winsize + 1) // 2] *= 2  # one-sided: double all but DC (and Nyquist)
+
+    peak_idx = np.argmax(psd, axis=1)
+    peak_pow = psd[np.arange(len(starts)), peak_idx]
+    return rfftfreq(winsize, 1/FS)[peak_idx[peak_pow > min_power]]
 
 class TremorAnalyzerGUI:
     def __init__(self, root):
@@ -112,34 +148,39 @@ class TremorAnalyzerGUI:
             self.root.update()
 
             # 1. Load Data
-            df = pd.read_csv('tremor_data.csv')
-            for c in ['ax','ay','az','gx','gy','gz']: 
-                df[c] = pd.to_numeric(df[c], errors='coerce')
+            try:
+                df = pd.read_csv('tremor_data.csv', usecols=SENSOR_COLS, dtype=np.float32)
+            except ValueError:
+                # Non-numeric field somewhere: coerce it to NaN so its row is dropped
+                df = pd.read_csv('tremor_data.csv', usecols=SENSOR_COLS).apply(pd.to_numeric, errors='coerce')
             df.dropna(inplace=True)
 
-            # 2. Prepare Filter
-            nyquist = 0.5 * FS
-            b, a = butter(FILTER_ORDER, [CUTOFF_LOW/nyquist, CUTOFF_HIGH/nyquist], btype='band')
+            # 2. Sensor magnitudes (DC removed)
+            raw_g = np.hypot(np.hypot(df['gx'].to_numpy(), df['gy'].to_numpy()), df['gz'].to_numpy())
+            raw_g -= raw_g.mean()
+            raw_a = np.hypot(np.hypot(df['ax'].to_numpy(), df['ay'].to_numpy()), df['az'].to_numpy())
+            raw_a -= raw_a.mean()
+
+            # 3. Filter both sensors in one call (same filter removes gravity!)
+            filtered = sosfiltfilt(SOS_BANDPASS, np.stack([raw_g, raw_a]), axis=-1)
+
+            # 4. PSD of both sensors in one Welch call
+            # FFT length snapped to a 5-smooth size pocketfft handles fastest
+            # (the default 4 s @ 100 Hz window, 400 samples, already is one)
+            nperseg = min(filtered.shape[-1], int(FS * WINDOW_SEC))
+            with set_workers(FFT_WORKERS):
+                f, psd = welch(filtered, FS, nperseg=nperseg, nfft=next_fast_len(nperseg, real=True), axis=-1)
+            # Spectral peak of both sensors in one row-wise reduction
+            peak_idx = psd.argmax(axis=-1)
 
-            # 3. Process GYRO
-            raw_g = np.sqrt(df['gx']**2 + df['gy']**2 + df['gz']**2)
-            raw_g = raw_g - np.mean(raw_g)
-            filt_g = filtfilt(b, a, raw_g)
-            
             self.plot_sensor_dashboard(
-                self.figs_gyro['axes'], self.figs_gyro['canvas'],
-                raw_g, filt_g, b, a, 
+                self.figs_gyro,
+                raw_g, filtered[0], f, psd[0], peak_idx[0],
                 COL_GYRO, COL_FILL_GYRO, "Gyroscope (deg/s)"
             )
-
-            # 4. Process ACCEL
-            raw_a = np.sqrt(df['ax']**2 + df['ay']**2 + df['az']**2)
-            raw_a = raw_a - np.mean(raw_a)
-            filt_a = filtfilt(b, a, raw_a) # Same filter removes gravity!
-            
             self.plot_sensor_dashboard(
-                self.figs_accel['axes'], self.figs_accel['canvas'],
-                raw_a, filt_a, b, a, 
+                self.figs_accel,
+                raw_a, filtered[1], f, psd[1], peak_idx[1],
                 COL_ACCEL, COL_FILL_ACCEL, "Accelerometer (g)"
             )
 
@@ -149,72 +190,90 @@ class TremorAnalyzerGUI:
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    def plot_sensor_dashboard(self, ax, canvas, raw, filtered, b, a, main_color, fill_color, unit_label):
-        t = np.arange(len(raw)) / FS
-        
+    def create_dashboard_artists(self, ax, main_color, fill_color, unit_label):
+        """ Creates the lines/bars of one dashboard once; later loads only update their data """
+        art = {}
+
         # 1. Time Raw
-        ax['time_raw'].clear()
-        ax['time_raw'].plot(t, raw, color='#7F7F7F', linewidth=0.8, alpha=0.6)
+        art['raw'], = ax['time_raw'].plot([], [], color='#7F7F7F', linewidth=0.8, alpha=0.6)
         ax['time_raw'].set_title(f"Raw Input")
         ax['time_raw'].set_ylabel(unit_label)
         ax['time_raw'].margins(x=0)
 
         # 2. Time Filtered
-        ax['time_filt'].clear()
-        ax['time_filt'].plot(t, filtered, color=main_color, linewidth=1.2)
+        art['filt'], = ax['time_filt'].plot([], [], color=main_color, linewidth=1.2)
         ax['time_filt'].set_title(f"Filtered Output ({CUTOFF_LOW}-{CUTOFF_HIGH} Hz)")
         ax['time_filt'].set_ylabel(unit_label)
         ax['time_filt'].margins(x=0)
 
-        # 3. Bode Plot (Filter Response)
-        w, h = freqz(b, a, worN=4096, fs=FS)
-        ax['bode_amp'].clear()
-        ax['bode_amp'].plot(w, 20 * np.log10(abs(h)), color='purple')
+        # 3. Bode Plot (Filter Response) - fixed filter, drawn once
+        ax['bode_amp'].plot(BODE_FREQ, BODE_MAG_DB, color='purple')
         ax['bode_amp'].set_title("Filter Amplitude Response")
         ax['bode_amp'].set_ylabel("Magnitude [dB]")
         ax['bode_amp'].set_ylim(-60, 5)
         ax['bode_amp'].axvline(CUTOFF_LOW, color='red', linestyle='--')
         ax['bode_amp'].axvline(CUTOFF_HIGH, color='red', linestyle='--')
 
-        ax['bode_phase'].clear()
-        ax['bode_phase'].plot(w, np.degrees(np.unwrap(np.angle(h))), color='green')
+        ax['bode_phase'].plot(BODE_FREQ, BODE_PHASE_DEG, color='green')
         ax['bode_phase'].set_title("Filter Phase Response")
         ax['bode_phase'].set_ylabel("Phase [deg]")
 
-        # 4. PSD
-        nperseg = min(len(filtered), int(FS * WINDOW_SEC))
-        f, p = welch(filtered, FS, nperseg=nperseg)
-        p_db = 10 * np.log10(p + 1e-10)
-        pk_f = f[np.argmax(p)]
-        
-        ax['psd'].clear()
-        ax['psd'].plot(f, p_db, color='black', linewidth=1)
-        ax['psd'].fill_between(f, p_db, where=((f>=3)&(f<=7)), color=fill_color, alpha=0.5, label='Tremor Band')
-        ax['psd'].plot(pk_f, p_db[np.argmax(p)], 'o', color=main_color)
-        ax['psd'].set_title(f"PSD Spectrum (Peak: {pk_f:.2f} Hz)")
+        # 4. PSD (the band fill is replaced per load)
+        art['psd'], = ax['psd'].plot([], [], color='black', linewidth=1)
+        art['psd_fill'] = ax['psd'].fill_between([], [], color=fill_color, alpha=0.5, label='Tremor Band')
+        art['psd_peak'], = ax['psd'].plot([], [], 'o', color=main_color)
         ax['psd'].set_ylabel("Power [dB]")
         ax['psd'].set_xlabel("Frequency [Hz]")
         ax['psd'].set_xlim(0, 15)
         ax['psd'].legend(loc='upper right')
 
-        # 5. Histogram
-        winsize = int(FS * 1)
-        step = int(FS/2)
-        freqs = []
-        for i in range(0, len(filtered)-winsize, step):
-            seg = filtered[i:i+winsize]
-            f_s, p_s = welch(seg, FS, nperseg=winsize)
-            if np.max(p_s) > 0.1: freqs.append(f_s[np.argmax(p_s)])
-        
-        ax['hist'].clear()
-        if freqs:
-            ax['hist'].hist(freqs, bins=np.arange(0, 16, 1), color=main_color, alpha=0.6, edgecolor='black')
+        # 5. Histogram (one bar per HIST_BINS bin, heights set per load)
+        art['hist'] = ax['hist'].bar(HIST_BINS[:-1], np.zeros(len(HIST_BINS) - 1), width=np.diff(HIST_BINS),
+                                     align='edge', color=main_color, alpha=0.6, edgecolor='black')
         ax['hist'].set_title("Tremor Stability")
         ax['hist'].set_ylabel("Count")
         ax['hist'].set_xlabel("Frequency [Hz]")
         ax['hist'].set_xlim(0, 15)
 
-        canvas.draw()
+        return art
+
+    def plot_sensor_dashboard(self, dash, raw, filtered, f, p, pk, main_color, fill_color, unit_label):
+        ax = dash['axes']
+        if 'artists' not in dash:
+            dash['artists'] = self.create_dashboard_artists(ax, main_color, fill_color, unit_label)
+        art = dash['artists']
+
+        t = np.arange(len(raw)) / FS
+        
+        # 1. Time Raw
+        art['raw'].set_data(t, raw)
+
+        # 2. Time Filtered
+        art['filt'].set_data(t, filtered)
+
+        # 4. PSD
+        p_db = 10 * np.log10(p + 1e-10)
+        pk_f = f[pk]
+        
+        art['psd'].set_data(f, p_db)
+        art['psd_fill'].remove()
+        art['psd_fill'] = ax['psd'].fill_between(f, p_db, where=((f>=3)&(f<=7)), color=fill_color, alpha=0.5)
+        art['psd_peak'].set_data([pk_f], [p_db[pk]])
+        ax['psd'].set_title(f"PSD Spectrum (Peak: {pk_f:.2f} Hz)")
+
+        # 5. Histogram
+        winsize = int(FS * 1)
+        step = int(FS/2)
+        freqs = sliding_peak_freqs(filtered, winsize, step, min_power=0.1)
+        counts, _ = np.histogram(freqs, bins=HIST_BINS)
+        for bar, count in zip(art['hist'], counts):
+            bar.set_height(count)
+
+        for name in ['time_raw', 'time_filt', 'psd', 'hist']:
+            ax[name].relim()
+            ax[name].autoscale_view()
+
+        dash['canvas'].draw_idle()
 
 if __name__ == "__main__":
     root = tk.Tk()
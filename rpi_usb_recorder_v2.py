@@ -11,10 +11,12 @@ Improvements:
 
 import serial
 import serial.tools.list_ports
-import datetime
 import sys
 import os
+import re
 import time
+import collections
+import threading
 
 # CONFIG
 DEFAULT_PORT = '/dev/ttyUSB0'
@@ -22,23 +24,61 @@ BAUD_RATE = 115200
 OUTPUT_FOLDER = 'tremor_data'
 CONNECTION_TIMEOUT = 5.0  # Seconds - alert if no data received
 EXPECTED_COLUMNS = 7      # Timestamp,Ax,Ay,Az,Gx,Gy,Gz
+CYCLE_PATH_PREFIX = f"{OUTPUT_FOLDER}/tremor_cycle"  # + "{cycle}_{YYYYmmdd_HHMMSS}.csv/.log"
+WRITE_BATCH = 100         # CSV lines joined per write(2) call (1s at 100 Hz)
+DIGIT_BYTES = frozenset(b'0123456789')  # Leading byte of a sample line
+FIELD_SEP = b','          # Raw serial lines are matched as bytes (no per-line str temporaries)
+HEADER_PREFIX = b'Timestamp'
+SAMPLE_RE = re.compile(rb'(\d+)(?:,-?\d+(?:\.\d+)?){6}')  # Firmware's "%lu,%.3f x6" sample format
+ECHO_THROTTLE = 0.2       # Seconds - repeats of the same non-data line printed at most this often
+ECHO_ALWAYS = frozenset(['START_RECORDING', 'CYCLE', 'PAUSE_CYCLE', 'RESUME_CYCLE',
+                         'END_RECORDING', 'RESETS', 'ALL_COMPLETE'])  # State changes are never throttled
+QUEUE_POLL = 1.0          # Seconds - consumer wakes at least this often for timeout checks
+LINE_BUFFER_SIZE = 8192   # Lines (~80s at 100 Hz) held before the oldest are dropped
 
 def create_output_folder():
-    if not os.path.exists(OUTPUT_FOLDER):
-        os.makedirs(OUTPUT_FOLDER)
+    existed = os.path.isdir(OUTPUT_FOLDER)
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    if not existed:
         print(f"📁 Created folder: {OUTPUT_FOLDER}/")
 
+# Log timestamp cache - formatted at most once per wall-clock second
+_log_ts_sec = None
+_log_ts_str = ''
+
 def log_event(log_file, event_type, message):
     """Log events to error/event log file"""
+    global _log_ts_sec, _log_ts_str
     if log_file:
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_file.write(f"[{timestamp}] {event_type}: {message}\n")
-        log_file.flush()
-
-def validate_data_line(line):
-    """Validate CSV data line format (7 columns expected)"""
+        now = int(time.time())
+        if now != _log_ts_sec:
+            _log_ts_sec = now
+            _log_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        log_file.write(f"[{_log_ts_str}] {event_type}: {message}\n")  # Line-buffered file
+
+def write_lines(f, buf):
+    """Write buffered CSV lines straight to the file descriptor and empty the buffer"""
+    if buf:
+        data = memoryview(b''.join(buf))
+        fd = f.fileno()
+        while data:
+            data = data[os.write(fd, data):]
+        buf.clear()
+
+def sync_file(f):
+    """Flush a file and force it to disk (pause/end checkpoints)"""
+    f.flush()
+    os.fsync(f.fileno())
+
+def validate_data_line(parts):
+    """Validate a split raw CSV data line (7 columns expected)
+
+    Slow path with a specific error message - on_sample only calls it for
+    lines that SAMPLE_RE rejects.
+    """
+    # Error messages quote the fields, so decode them as the console/log text
+    parts = [p.decode('utf-8', errors='ignore') for p in parts]
     try:
-        parts = line.split(',')
         if len(parts) != EXPECTED_COLUMNS:
             return False, f"Expected {EXPECTED_COLUMNS} columns, got {len(parts)}"
 
@@ -73,6 +113,17 @@ def find_port():
     
     return DEFAULT_PORT
 
+def set_low_latency(ser):
+    """Ask the USB-serial driver to push bytes immediately (ASYNC_LOW_LATENCY)
+
+    FTDI/CH340 adapters otherwise hold data for up to 16 ms before handing it
+    to the tty. No-op on ports/platforms that don't support it.
+    """
+    try:
+        ser.set_low_latency_mode(True)
+    except (AttributeError, OSError, ValueError):
+        pass
+
 def safe_serial_open(port, baud, timeout=2):
     try:
         ser = serial.Serial(
@@ -80,6 +131,7 @@ def safe_serial_open(port, baud, timeout=2):
             baudrate=baud,
             timeout=timeout
         )
+        set_low_latency(ser)
         time.sleep(2)
         ser.reset_input_buffer()
         ser.reset_output_buffer()
@@ -89,6 +141,408 @@ def safe_serial_open(port, baud, timeout=2):
         print("💡 Try: sudo chmod 666 " + port)
         return None
 
+class CycleRecorder:
+    """Recording state machine driven by the ESP32 serial protocol"""
+
+    def __init__(self):
+        self.recording = False
+        self.paused = False
+        self.done = False
+        self.current_cycle = 0  # Track current cycle number
+        self.csv_file = None
+        self.csv_filename = None
+        self.write_buf = []  # Pending CSV lines, written every WRITE_BATCH samples
+        self.log_file = None
+        self.log_filename = None
+        self.data_count = 0
+        self.last_timestamp = 0
+
+        # Error tracking
+        self.sensor_resets = 0
+        self.error_count = 0
+        self.validation_errors = 0
+        self.now = time.monotonic()  # Clock reading for the current loop iteration
+        self.last_data_time = self.now  # For timeout detection
+        self.last_echo = {}  # Line tag -> time it was last printed
+        self.echo = True  # Whether the current line is printed to the console
+
+        # Metadata for CSV header
+        self.cycle_metadata = {
+            'start_time': None,
+            'sensor_resets': 0,
+            'errors': 0,
+            'validation_errors': 0
+        }
+
+    def check_timeout(self):
+        """Connection timeout detection"""
+        if self.recording and not self.paused:
+            elapsed_since_data = self.now - self.last_data_time
+            if elapsed_since_data > CONNECTION_TIMEOUT:
+                warning_msg = f"⚠️  WARNING: No data received for {elapsed_since_data:.1f}s!"
+                print(warning_msg)
+                if self.log_file:
+                    log_event(self.log_file, "WARNING", f"Connection timeout - no data for {elapsed_since_data:.1f}s")
+                self.error_count += 1
+                self.last_data_time = self.now  # Reset to avoid spam
+
+    def handle_line(self, raw):
+        """Dispatch one serial line (newline removed, 2+ bytes) by its first comma-separated token
+
+        Classification is one set lookup on the leading byte plus one dict
+        lookup on the tag; a JIT'd classifier costs more per call than that.
+        """
+        if raw[0] in DIGIT_BYTES and FIELD_SEP in raw:
+            # Samples are printf'd with a bare LF - only a stray CR needs trimming
+            if raw[-1] == 13:
+                raw = raw[:-1]
+            self.on_sample(raw)
+            return
+
+        # Print non-data lines (only these are stripped and decoded), throttling
+        # repeats so an ESP32 error storm doesn't turn into a console storm
+        raw = raw.strip()
+        if not raw:
+            return
+        line = raw.decode('utf-8', errors='ignore')
+        tag = line.partition(',')[0]
+        last = self.last_echo.get(tag)
+        self.echo = last is None or self.now - last >= ECHO_THROTTLE or tag in ECHO_ALWAYS
+        if self.echo:
+            self.last_echo[tag] = self.now
+            print(line)
+
+        handler = HANDLERS.get(tag)
+        if handler:
+            handler(self, line)
+        elif raw.startswith(HEADER_PREFIX):
+            self.on_header(raw)
+
+    # ═══════════════════════════════════
+    # Start recording
+    # ═══════════════════════════════════
+    def on_start(self, line):
+        self.recording = True
+        self.paused = False
+        self.data_count = 0
+
+    # ═══════════════════════════════════
+    # New cycle detection (FIXED!)
+    # ═══════════════════════════════════
+    def on_cycle(self, line):
+        if not self.recording:
+            return
+        try:
+            cycle_num = int(line.split(',')[1])
+        except:
+            cycle_num = self.current_cycle + 1
+
+        # Only create NEW file if cycle number changed!
+        if cycle_num == self.current_cycle:
+            # Same cycle - keep using existing file
+            print(f"   (Continuing cycle {self.current_cycle} in same file)")
+            return
+        self.current_cycle = cycle_num
+
+        # Close old files if exist
+        if self.csv_file:
+            write_lines(self.csv_file, self.write_buf)
+            self.csv_file.close()
+            print(f"   (Closed previous CSV file)")
+        if self.log_file:
+            self.log_file.close()
+            print(f"   (Closed previous log file)")
+
+        # Reset metadata
+        start = time.localtime()
+        self.cycle_metadata = {
+            'start_time': time.strftime("%Y-%m-%d %H:%M:%S", start),
+            'sensor_resets': 0,
+            'errors': 0,
+            'validation_errors': 0
+        }
+        self.sensor_resets = 0
+        self.error_count = 0
+        self.validation_errors = 0
+
+        # Create new files
+        base = f"{CYCLE_PATH_PREFIX}{self.current_cycle}_{time.strftime('%Y%m%d_%H%M%S', start)}"
+        self.csv_filename = base + ".csv"
+        self.log_filename = base + ".log"
+
+        self.csv_file = open(self.csv_filename, 'wb', buffering=0)  # Batched by write_lines
+        self.log_file = open(self.log_filename, 'w', buffering=1)
+
+        # Write CSV metadata header
+        write_lines(self.csv_file, [(f"# Cycle: {self.current_cycle}\n"
+                                     f"# Start Time: {self.cycle_metadata['start_time']}\n"
+                                     f"# Sample Rate: 100 Hz\n"
+                                     f"# Format: Timestamp(ms),Ax(m/s²),Ay,Az,Gx(°/s),Gy,Gz\n").encode('utf-8')])
+
+        log_event(self.log_file, "INFO", f"Cycle {self.current_cycle} started")
+
+        print(f"\n📝 Recording to: {self.csv_filename}")
+        print(f"📄 Log file: {self.log_filename}")
+        print(f"   Cycle: {self.current_cycle} | Rate: 100 Hz")
+        print(f"   (Pause/Resume will use SAME file)\n")
+
+    # ═══════════════════════════════════
+    # ESP32 Error Events
+    # ═══════════════════════════════════
+    def on_sensor_stuck(self, line):
+        error_msg = "🚨 ESP32: Sensor freeze detected (15 constant samples)"
+        if self.echo:
+            print(error_msg)
+        if self.log_file:
+            log_event(self.log_file, "ERROR", "Sensor stuck - 15 constant samples detected")
+        self.error_count += 1
+
+    def on_sensor_lost(self, line):
+        error_msg = "🚨 ESP32: Sensor connection lost"
+        if self.echo:
+            print(error_msg)
+        if self.log_file:
+            log_event(self.log_file, "ERROR", "Sensor connection lost")
+        self.error_count += 1
+
+    def on_read_failed(self, line):
+        error_msg = "🚨 ESP32: Sensor read failed"
+        if self.echo:
+            print(error_msg)
+        if self.log_file:
+            log_event(self.log_file, "ERROR", "Sensor read failed")
+        self.error_count += 1
+
+    def on_sensor_reset(self, line):
+        try:
+            reset_count = int(line.split(',')[1])
+            self.sensor_resets = reset_count
+            self.cycle_metadata['sensor_resets'] = self.sensor_resets
+            print(f"🔄 ESP32: Sensor reset #{reset_count}")
+            if self.log_file:
+                log_event(self.log_file, "RESET", f"Sensor reset #{reset_count}")
+        except:
+            pass
+
+    def on_reset_ok(self, line):
+        print("✅ ESP32: Sensor reset successful")
+        if self.log_file:
+            log_event(self.log_file, "INFO", "Sensor reset successful")
+
+    def on_reset_failed(self, line):
+        if self.echo:
+            print("❌ ESP32: Sensor reset FAILED")
+        if self.log_file:
+            log_event(self.log_file, "CRITICAL", "Sensor reset FAILED")
+        self.error_count += 1
+
+    def on_total_resets(self, line):
+        try:
+            total_resets = int(line.split(',')[1])
+            print(f"📊 Total sensor resets this cycle: {total_resets}")
+            if self.log_file:
+                log_event(self.log_file, "INFO", f"Total sensor resets: {total_resets}")
+        except:
+            pass
+
+    # ═══════════════════════════════════
+    # Pause (don't close file!)
+    # ═══════════════════════════════════
+    def on_pause(self, line):
+        self.paused = True
+        if self.csv_file:
+            write_lines(self.csv_file, self.write_buf)
+            sync_file(self.csv_file)
+        print(f"\n⏸️  PAUSED ({self.data_count} samples so far)")
+        print(f"   File stays open: {self.csv_filename}\n")
+        if self.log_file:
+            log_event(self.log_file, "INFO", f"Recording paused at {self.data_count} samples")
+
+    # ═══════════════════════════════════
+    # Resume (continue writing to same file!)
+    # ═══════════════════════════════════
+    def on_resume(self, line):
+        self.paused = False
+        print(f"\n▶️  RESUMED")
+        print(f"   Continuing to: {self.csv_filename}\n")
+        if self.log_file:
+            log_event(self.log_file, "INFO", f"Recording resumed at {self.data_count} samples")
+        self.last_data_time = self.now  # Reset timeout counter
+
+    # ═══════════════════════════════════
+    # End recording (now close file)
+    # ═══════════════════════════════════
+    def on_end(self, line):
+        self.recording = False
+        if not self.csv_file:
+            return
+
+        # Update final metadata
+        self.cycle_metadata['errors'] = self.error_count
+        self.cycle_metadata['validation_errors'] = self.validation_errors
+        self.cycle_metadata['sensor_resets'] = self.sensor_resets
+
+        # Write summary to log
+        if self.log_file:
+            log_event(self.log_file, "INFO", f"Recording complete - {self.data_count} samples")
+            log_event(self.log_file, "SUMMARY", f"Duration: {self.last_timestamp/1000:.1f}s")
+            log_event(self.log_file, "SUMMARY", f"Sensor resets: {self.sensor_resets}")
+            log_event(self.log_file, "SUMMARY", f"Errors: {self.error_count}")
+            log_event(self.log_file, "SUMMARY", f"Validation errors: {self.validation_errors}")
+            sync_file(self.log_file)
+            self.log_file.close()
+            self.log_file = None
+
+        write_lines(self.csv_file, self.write_buf)
+        sync_file(self.csv_file)
+        self.csv_file.close()
+        print(f"\n✅ Cycle {self.current_cycle} Complete!")
+        print(f"   Total samples: {self.data_count}")
+        print(f"   Duration: {self.last_timestamp/1000:.1f}s")
+        print(f"   Sensor resets: {self.sensor_resets}")
+        print(f"   Errors: {self.error_count}")
+        print(f"   Validation errors: {self.validation_errors}")
+        print(f"   CSV: {self.csv_filename}")
+        print(f"   Log: {self.log_filename}")
+        print("="*60 + "\n")
+        self.csv_file = None
+        self.csv_filename = None
+        self.log_filename = None
+
+    # ═══════════════════════════════════
+    # All done
+    # ═══════════════════════════════════
+    def on_all_complete(self, line):
+        print("\n🎉 All cycles complete!")
+        self.done = True
+
+    # ═══════════════════════════════════
+    # Save data (even during pause/resume!)
+    # ═══════════════════════════════════
+    # Raw bytes go straight to the binary CSV (no decode/encode round-trip)
+    def on_header(self, raw):
+        if not (self.recording and not self.paused and self.csv_file and FIELD_SEP in raw):
+            return
+        self.write_buf.append(raw + b'\n')
+        self.last_data_time = self.now  # Reset timeout
+
+    def on_sample(self, raw):
+        if not (self.recording and not self.paused and self.csv_file):
+            return
+        # Validate data format (one regex match for well-formed samples)
+        match = SAMPLE_RE.fullmatch(raw)
+        if match:
+            is_valid, error_msg, timestamp = True, None, match[1]
+        else:
+            parts = raw.split(FIELD_SEP)
+            is_valid, error_msg = validate_data_line(parts)
+            timestamp = parts[0]
+        if not is_valid:
+            self.validation_errors += 1
+            print(f"⚠️  Data validation error: {error_msg}")
+            if self.log_file:
+                line = raw.decode('utf-8', errors='ignore')
+                log_event(self.log_file, "VALIDATION_ERROR", f"{error_msg} | Line: {line[:50]}")
+            # Still write data, but flag it
+            self.write_buf.append(b'# INVALID: ' + raw + b'\n')
+        else:
+            self.write_buf.append(raw + b'\n')
+
+        self.data_count += 1
+        if len(self.write_buf) >= WRITE_BATCH:
+            write_lines(self.csv_file, self.write_buf)
+        self.last_data_time = self.now  # Reset timeout
+
+        try:
+            self.last_timestamp = int(timestamp)
+        except:
+            pass
+
+        # Progress every second
+        if self.data_count % 100 == 0:
+            print(f"   📊 {self.data_count:5d} samples | {self.last_timestamp/1000:6.1f}s")
+
+    def on_dropped(self, count, total):
+        print(f"⚠️  WARNING: Dropped {count} serial lines (writer fell behind)")
+        if self.log_file:
+            log_event(self.log_file, "DROP", f"Dropped {count} lines ({total} total) - gap in CSV")
+
+    def close(self):
+        """Save and close any open cycle files"""
+        if self.csv_file:
+            write_lines(self.csv_file, self.write_buf)
+            sync_file(self.csv_file)
+            self.csv_file.close()
+            print(f"\n💾 Final save: {self.csv_filename}")
+        if self.log_file:
+            log_event(self.log_file, "INFO", "Session interrupted")
+            sync_file(self.log_file)
+            self.log_file.close()
+            print(f"💾 Log saved: {self.log_filename}")
+
+# Protocol token (first comma-separated field) -> CycleRecorder handler
+HANDLERS = {
+    'START_RECORDING': CycleRecorder.on_start,
+    'CYCLE': CycleRecorder.on_cycle,
+    'ERROR_SENSOR_STUCK': CycleRecorder.on_sensor_stuck,
+    'ERROR_SENSOR_LOST': CycleRecorder.on_sensor_lost,
+    'ERROR_READ_FAILED': CycleRecorder.on_read_failed,
+    'SENSOR_RESET': CycleRecorder.on_sensor_reset,
+    'SENSOR_RESET_OK': CycleRecorder.on_reset_ok,
+    'SENSOR_RESET_FAILED': CycleRecorder.on_reset_failed,
+    'RESETS': CycleRecorder.on_total_resets,
+    'PAUSE_CYCLE': CycleRecorder.on_pause,
+    'RESUME_CYCLE': CycleRecorder.on_resume,
+    'END_RECORDING': CycleRecorder.on_end,
+    'ALL_COMPLETE': CycleRecorder.on_all_complete,
+}
+
+class LineBuffer:
+    """Bounded newest-wins line queue between the serial reader and the recorder"""
+
+    def __init__(self, maxlen=LINE_BUFFER_SIZE):
+        self.lines = collections.deque(maxlen=maxlen)
+        self.cond = threading.Condition()
+        self.dropped = 0  # Lines overwritten because the consumer fell behind
+
+    def put(self, raw):
+        self.extend([raw])
+
+    def extend(self, raws):
+        """Append a batch of lines under a single lock acquisition"""
+        with self.cond:
+            self.dropped += max(0, len(self.lines) + len(raws) - self.lines.maxlen)
+            self.lines.extend(raws)
+            self.cond.notify()
+
+    def get(self, timeout):
+        """Oldest buffered line, or b'' if nothing arrived within timeout"""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.lines, timeout):
+                return b''
+            return self.lines.popleft()
+
+def serial_reader(ser, lines, stop):
+    """Producer thread: push raw serial lines onto the queue until stopped
+
+    Reads everything the driver has queued in one call and splits lines in
+    memory - pyserial's readline() fetches one byte per read() call.
+    """
+    pending = b''
+    try:
+        while not stop.is_set():
+            # Blocks for the first byte (port timeout), then takes the whole backlog
+            chunk = ser.read(ser.in_waiting or 1)
+            if not chunk:
+                continue
+            *complete, pending = (pending + chunk).split(b'\n')
+            if complete:
+                lines.extend(complete)
+    except OSError as e:
+        print(f"❌ Serial read error: {e}")
+    finally:
+        lines.put(None)  # Sentinel - reader has stopped
+
 def record_data(port):
     print(f"\n📡 Connecting to {port}...")
     
@@ -100,297 +554,39 @@ def record_data(port):
     print("\n🎬 Waiting for ESP32 to start recording...")
     print("="*60)
     
-    recording = False
-    paused = False
-    current_cycle = 0  # Track current cycle number
-    csv_file = None
-    csv_filename = None
-    log_file = None
-    log_filename = None
-    data_count = 0
-    last_timestamp = 0
-
-    # Error tracking
-    sensor_resets = 0
-    error_count = 0
-    validation_errors = 0
-    last_data_time = time.time()  # For timeout detection
-
-    # Metadata for CSV header
-    cycle_metadata = {
-        'start_time': None,
-        'sensor_resets': 0,
-        'errors': 0,
-        'validation_errors': 0
-    }
+    recorder = CycleRecorder()
+
+    # Serial reads run on their own thread so a slow SD write never stalls the port
+    lines = LineBuffer()
+    dropped = 0
+    stop = threading.Event()
+    reader = threading.Thread(target=serial_reader, args=(ser, lines, stop), daemon=True)
+    reader.start()
     
     try:
-        while True:
-            # Connection timeout detection
-            if recording and not paused:
-                elapsed_since_data = time.time() - last_data_time
-                if elapsed_since_data > CONNECTION_TIMEOUT:
-                    warning_msg = f"⚠️  WARNING: No data received for {elapsed_since_data:.1f}s!"
-                    print(warning_msg)
-                    if log_file:
-                        log_event(log_file, "WARNING", f"Connection timeout - no data for {elapsed_since_data:.1f}s")
-                    error_count += 1
-                    last_data_time = time.time()  # Reset to avoid spam
-
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                
-                if not line:
-                    continue
-                
-                # Print non-data lines
-                if not (line[0].isdigit() and ',' in line):
-                    print(line)
-                
-                # ═══════════════════════════════════
-                # Start recording
-                # ═══════════════════════════════════
-                if "START_RECORDING" in line:
-                    recording = True
-                    paused = False
-                    data_count = 0
-                    continue
-                
-                # ═══════════════════════════════════
-                # New cycle detection (FIXED!)
-                # ═══════════════════════════════════
-                if "CYCLE," in line and recording:
-                    try:
-                        cycle_num = int(line.split(',')[1])
-                    except:
-                        cycle_num = current_cycle + 1
-                    
-                    # Only create NEW file if cycle number changed!
-                    if cycle_num != current_cycle:
-                        current_cycle = cycle_num
-
-                        # Close old files if exist
-                        if csv_file:
-                            csv_file.close()
-                            print(f"   (Closed previous CSV file)")
-                        if log_file:
-                            log_file.close()
-                            print(f"   (Closed previous log file)")
-
-                        # Reset metadata
-                        cycle_metadata = {
-                            'start_time': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'sensor_resets': 0,
-                            'errors': 0,
-                            'validation_errors': 0
-                        }
-                        sensor_resets = 0
-                        error_count = 0
-                        validation_errors = 0
-
-                        # Create new files
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                        csv_filename = f"{OUTPUT_FOLDER}/tremor_cycle{current_cycle}_{timestamp}.csv"
-                        log_filename = f"{OUTPUT_FOLDER}/tremor_cycle{current_cycle}_{timestamp}.log"
-
-                        csv_file = open(csv_filename, 'w')
-                        log_file = open(log_filename, 'w')
-
-                        # Write CSV metadata header
-                        csv_file.write(f"# Cycle: {current_cycle}\n")
-                        csv_file.write(f"# Start Time: {cycle_metadata['start_time']}\n")
-                        csv_file.write(f"# Sample Rate: 100 Hz\n")
-                        csv_file.write(f"# Format: Timestamp(ms),Ax(m/s²),Ay,Az,Gx(°/s),Gy,Gz\n")
-
-                        log_event(log_file, "INFO", f"Cycle {current_cycle} started")
-
-                        print(f"\n📝 Recording to: {csv_filename}")
-                        print(f"📄 Log file: {log_filename}")
-                        print(f"   Cycle: {current_cycle} | Rate: 100 Hz")
-                        print(f"   (Pause/Resume will use SAME file)\n")
-                    else:
-                        # Same cycle - keep using existing file
-                        print(f"   (Continuing cycle {current_cycle} in same file)")
-
-                    continue
-
-                # ═══════════════════════════════════
-                # ESP32 Error Events
-                # ═══════════════════════════════════
-                if "ERROR_SENSOR_STUCK" in line:
-                    error_msg = "🚨 ESP32: Sensor freeze detected (15 constant samples)"
-                    print(error_msg)
-                    if log_file:
-                        log_event(log_file, "ERROR", "Sensor stuck - 15 constant samples detected")
-                    error_count += 1
-                    continue
-
-                if "ERROR_SENSOR_LOST" in line:
-                    error_msg = "🚨 ESP32: Sensor connection lost"
-                    print(error_msg)
-                    if log_file:
-                        log_event(log_file, "ERROR", "Sensor connection lost")
-                    error_count += 1
-                    continue
-
-                if "ERROR_READ_FAILED" in line:
-                    error_msg = "🚨 ESP32: Sensor read failed"
-                    print(error_msg)
-                    if log_file:
-                        log_event(log_file, "ERROR", "Sensor read failed")
-                    error_count += 1
-                    continue
-
-                if "SENSOR_RESET," in line:
-                    try:
-                        reset_count = int(line.split(',')[1])
-                        sensor_resets = reset_count
-                        cycle_metadata['sensor_resets'] = sensor_resets
-                        print(f"🔄 ESP32: Sensor reset #{reset_count}")
-                        if log_file:
-                            log_event(log_file, "RESET", f"Sensor reset #{reset_count}")
-                    except:
-                        pass
-                    continue
-
-                if "SENSOR_RESET_OK" in line:
-                    print("✅ ESP32: Sensor reset successful")
-                    if log_file:
-                        log_event(log_file, "INFO", "Sensor reset successful")
-                    continue
-
-                if "SENSOR_RESET_FAILED" in line:
-                    print("❌ ESP32: Sensor reset FAILED")
-                    if log_file:
-                        log_event(log_file, "CRITICAL", "Sensor reset FAILED")
-                    error_count += 1
-                    continue
-
-                if "RESETS," in line:
-                    try:
-                        total_resets = int(line.split(',')[1])
-                        print(f"📊 Total sensor resets this cycle: {total_resets}")
-                        if log_file:
-                            log_event(log_file, "INFO", f"Total sensor resets: {total_resets}")
-                    except:
-                        pass
-                    continue
-
-                # ═══════════════════════════════════
-                # Pause (don't close file!)
-                # ═══════════════════════════════════
-                if "PAUSE_CYCLE" in line:
-                    paused = True
-                    print(f"\n⏸️  PAUSED ({data_count} samples so far)")
-                    print(f"   File stays open: {csv_filename}\n")
-                    if log_file:
-                        log_event(log_file, "INFO", f"Recording paused at {data_count} samples")
-                    continue
-
-                # ═══════════════════════════════════
-                # Resume (continue writing to same file!)
-                # ═══════════════════════════════════
-                if "RESUME_CYCLE" in line:
-                    paused = False
-                    print(f"\n▶️  RESUMED")
-                    print(f"   Continuing to: {csv_filename}\n")
-                    if log_file:
-                        log_event(log_file, "INFO", f"Recording resumed at {data_count} samples")
-                    last_data_time = time.time()  # Reset timeout counter
-                    continue
-                
-                # ═══════════════════════════════════
-                # End recording (now close file)
-                # ═══════════════════════════════════
-                if "END_RECORDING" in line:
-                    recording = False
-                    if csv_file:
-                        # Update final metadata
-                        cycle_metadata['errors'] = error_count
-                        cycle_metadata['validation_errors'] = validation_errors
-                        cycle_metadata['sensor_resets'] = sensor_resets
-
-                        # Write summary to log
-                        if log_file:
-                            log_event(log_file, "INFO", f"Recording complete - {data_count} samples")
-                            log_event(log_file, "SUMMARY", f"Duration: {last_timestamp/1000:.1f}s")
-                            log_event(log_file, "SUMMARY", f"Sensor resets: {sensor_resets}")
-                            log_event(log_file, "SUMMARY", f"Errors: {error_count}")
-                            log_event(log_file, "SUMMARY", f"Validation errors: {validation_errors}")
-                            log_file.close()
-                            log_file = None
-
-                        csv_file.close()
-                        print(f"\n✅ Cycle {current_cycle} Complete!")
-                        print(f"   Total samples: {data_count}")
-                        print(f"   Duration: {last_timestamp/1000:.1f}s")
-                        print(f"   Sensor resets: {sensor_resets}")
-                        print(f"   Errors: {error_count}")
-                        print(f"   Validation errors: {validation_errors}")
-                        print(f"   CSV: {csv_filename}")
-                        print(f"   Log: {log_filename}")
-                        print("="*60 + "\n")
-                        csv_file = None
-                        csv_filename = None
-                        log_filename = None
-                    continue
-                
-                # ═══════════════════════════════════
-                # All done
-                # ═══════════════════════════════════
-                if "ALL_COMPLETE" in line:
-                    print("\n🎉 All cycles complete!")
-                    break
-                
-                # ═══════════════════════════════════
-                # Save data (even during pause/resume!)
-                # ═══════════════════════════════════
-                if recording and not paused and csv_file and ',' in line:
-                    # Header
-                    if line.startswith("Timestamp"):
-                        csv_file.write(line + '\n')
-                        csv_file.flush()
-                        last_data_time = time.time()  # Reset timeout
-                    # Data
-                    elif line[0].isdigit():
-                        # Validate data format
-                        is_valid, error_msg = validate_data_line(line)
-                        if not is_valid:
-                            validation_errors += 1
-                            print(f"⚠️  Data validation error: {error_msg}")
-                            if log_file:
-                                log_event(log_file, "VALIDATION_ERROR", f"{error_msg} | Line: {line[:50]}")
-                            # Still write data, but flag it
-                            csv_file.write(f"# INVALID: {line}\n")
-                        else:
-                            csv_file.write(line + '\n')
-
-                        csv_file.flush()
-                        data_count += 1
-                        last_data_time = time.time()  # Reset timeout
-
-                        try:
-                            last_timestamp = int(line.split(',')[0])
-                        except:
-                            pass
-
-                        # Progress every second
-                        if data_count % 100 == 0:
-                            print(f"   📊 {data_count:5d} samples | {last_timestamp/1000:6.1f}s")
-            else:
-                time.sleep(0.01)
+        while not recorder.done:
+            raw = lines.get(QUEUE_POLL)
+            recorder.now = time.monotonic()
+            recorder.check_timeout()
+            if raw is None:
+                break
+
+            if lines.dropped != dropped:
+                recorder.on_dropped(lines.dropped - dropped, lines.dropped)
+                dropped = lines.dropped
+
+            if len(raw) < 2:  # Empty line or a lone CR
+                continue
+
+            recorder.handle_line(raw)
     
     except KeyboardInterrupt:
         print("\n\n⏹️  Stopped by user")
     
     finally:
-        if csv_file:
-            csv_file.close()
-            print(f"\n💾 Final save: {csv_filename}")
-        if log_file:
-            log_event(log_file, "INFO", "Session interrupted")
-            log_file.close()
-            print(f"💾 Log saved: {log_filename}")
+        stop.set()
+        reader.join(timeout=ser.timeout)
+        recorder.close()
         if ser and ser.is_open:
             ser.close()
         print("✅ Connection closed")
@@ -4,20 +4,87 @@ Tremor Analysis Suitability Assessment
 Evaluates if the data quality is sufficient for tremor frequency analysis
 """
 
-import csv
-import math
-import sys
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
+import numpy as np
+
+# Recorder CSV columns (Timestamp in ms)
+CSV_DTYPES = {'Timestamp': np.int64, 'Ax': np.float64, 'Ay': np.float64, 'Az': np.float64,
+              'Gx': np.float64, 'Gy': np.float64, 'Gz': np.float64}
+ROW_DTYPE = np.dtype(list(CSV_DTYPES.items()))  # One parsed data row
+LOAD_CHUNK_ROWS = 100_000  # Rows parsed per pandas chunk (bounds peak memory)
+
+# Tremor types and their frequency bands (Hz), one [min, max] row per type
+TREMOR_TYPES = ["Parkinson's tremor", "Essential tremor", "Physiological tremor",
+                "Cerebellar tremor", "Action tremor"]
+TREMOR_BANDS = np.array([[3, 6], [4, 12], [8, 12], [2, 5], [4, 8]])
 
 def calculate_stats(values):
-    """Calculate mean, std, min, max of a list"""
-    n = len(values)
-    if n == 0:
+    """Calculate mean, std, min, max of an array (NumPy reductions)"""
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.size == 0:
         return 0, 0, 0, 0
 
-    mean = sum(values) / n
-    variance = sum((x - mean) ** 2 for x in values) / n
-    std = math.sqrt(variance)
-    return mean, std, min(values), max(values)
+    return arr.mean(), arr.std(), arr.min(), arr.max()
+
+def parse_rows(lines):
+    """Rows of 7 fields that int()/float() accept; any other line is skipped"""
+    rows = np.empty(len(lines), dtype=ROW_DTYPE)
+    n = 0
+    for line in lines:
+        parts = line.split(',')
+        if len(parts) != len(CSV_DTYPES):
+            continue
+        try:
+            rows[n] = (int(parts[0]), *map(float, parts[1:]))
+        except (ValueError, OverflowError):
+            continue
+        n += 1
+    return rows[:n]
+
+def load_data(csv_path):
+    """Load the data rows as one NumPy array per column (struct of arrays)
+
+    Parsed in chunks straight into arrays preallocated from a line count,
+    so a long recording never holds all its lines alongside the result.
+    Rows are filtered as int()/float() would: '#' and blank lines, rows
+    without exactly 7 fields and rows with an unparsable field are skipped.
+    """
+    # Find header (metadata comment lines precede it), then count lines
+    header_idx = 0
+    with open(csv_path, 'rb') as f:
+        for i, line in enumerate(f):
+            if line.startswith(b'Timestamp,'):
+                header_idx = i
+                break
+        f.seek(0)
+        n_lines = sum(block.count(b'\n') for block in iter(partial(f.read, 1 << 20), b''))
+
+    # Upper bound on data rows: lines after the header, +1 in case the last
+    # one has no trailing newline
+    n_rows = max(n_lines - header_idx, 0)
+    columns = {key: np.empty(n_rows, dtype=dtype) for key, dtype in CSV_DTYPES.items()}
+
+    n = 0
+    with open(csv_path, 'r') as f:
+        stripped = (line.strip() for line in itertools.islice(f, header_idx + 1, None))
+        data_lines = (line for line in stripped if line and not line.startswith('#'))
+        while chunk := list(itertools.islice(data_lines, LOAD_CHUNK_ROWS)):
+            # NumPy's C reader is strict (int64 Timestamp, float axes); a chunk
+            # it rejects is filtered line by line, dropping only the bad rows
+            try:
+                rows = np.loadtxt(chunk, delimiter=',', dtype=ROW_DTYPE, comments=None, ndmin=1)
+            except ValueError:
+                rows = parse_rows(chunk)
+            for key, column in columns.items():
+                column[n:n + len(rows)] = rows[key]
+            n += len(rows)
+
+    return {key: column[:n] for key, column in columns.items()}
 
 def analyze_tremor_suitability(csv_path):
     """Analyze if data is suitable for tremor analysis"""
@@ -27,39 +94,11 @@ def analyze_tremor_suitability(csv_path):
     print(f"{'='*70}\n")
 
     # Load data
-    data = []
-    with open(csv_path, 'r') as f:
-        lines = f.readlines()
-        # Find header
-        header_idx = 0
-        for i, line in enumerate(lines):
-            if line.startswith('Timestamp,'):
-                header_idx = i
-                break
+    data = load_data(csv_path)
+    timestamps = data['Timestamp']
 
-        # Parse data lines
-        for line in lines[header_idx + 1:]:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            try:
-                parts = line.split(',')
-                if len(parts) == 7:
-                    data.append({
-                        'Timestamp': int(parts[0]),
-                        'Ax': float(parts[1]),
-                        'Ay': float(parts[2]),
-                        'Az': float(parts[3]),
-                        'Gx': float(parts[4]),
-                        'Gy': float(parts[5]),
-                        'Gz': float(parts[6])
-                    })
-            except (ValueError, IndexError):
-                continue
-
-    total_samples = len(data)
-    duration_s = data[-1]['Timestamp'] / 1000.0
+    total_samples = len(timestamps)
+    duration_s = timestamps[-1] / 1000.0
 
     print(f"Dataset Overview:")
     print(f"  Total samples: {total_samples}")
@@ -67,14 +106,12 @@ def analyze_tremor_suitability(csv_path):
     print(f"  Actual sampling rate: {total_samples / duration_s:.2f} Hz")
 
     # Calculate time intervals
-    intervals = []
-    for i in range(1, len(data)):
-        dt = data[i]['Timestamp'] - data[i-1]['Timestamp']
-        intervals.append(dt)
+    intervals = np.diff(timestamps)
 
     mean_dt, std_dt, min_dt, max_dt = calculate_stats(intervals)
-    intervals_sorted = sorted(intervals)
-    median_dt = intervals_sorted[len(intervals_sorted) // 2]
+    # Upper median (middle element of the sorted intervals), found in O(n)
+    mid = len(intervals) // 2
+    median_dt = np.partition(intervals, mid)[mid]
 
     print(f"\n{'─'*70}")
     print(f"Timing Analysis:")
@@ -90,14 +127,6 @@ def analyze_tremor_suitability(csv_path):
     print(f"Tremor Frequency Requirements:")
     print(f"{'─'*70}")
 
-    tremor_types = {
-        "Parkinson's tremor": (3, 6),
-        "Essential tremor": (4, 12),
-        "Physiological tremor": (8, 12),
-        "Cerebellar tremor": (2, 5),
-        "Action tremor": (4, 8)
-    }
-
     actual_fs = total_samples / duration_s
     nyquist_freq = actual_fs / 2
 
@@ -106,15 +135,15 @@ def analyze_tremor_suitability(csv_path):
     print(f"\n  Can detect frequencies up to: {nyquist_freq:.1f} Hz")
     print(f"\n  Tremor type coverage:")
 
-    all_suitable = True
-    for tremor_type, (min_hz, max_hz) in tremor_types.items():
-        required_fs = max_hz * 2  # Nyquist criterion
-        suitable = actual_fs >= required_fs * 1.5  # 1.5x margin for safety
-        status = "✅" if suitable else "⚠️"
-        margin = actual_fs / required_fs
+    # Margin of every tremor type at once
+    required_fs = TREMOR_BANDS[:, 1] * 2  # Nyquist criterion
+    margins = actual_fs / required_fs
+    suitable = actual_fs >= required_fs * 1.5  # 1.5x margin for safety
+    all_suitable = suitable.all()
+
+    for tremor_type, (min_hz, max_hz), margin, ok in zip(TREMOR_TYPES, TREMOR_BANDS, margins, suitable):
+        status = "✅" if ok else "⚠️"
         print(f"    {status} {tremor_type}: {min_hz}-{max_hz} Hz (margin: {margin:.1f}x)")
-        if not suitable:
-            all_suitable = False
 
     # Signal quality analysis
     print(f"\n{'─'*70}")
@@ -122,12 +151,12 @@ def analyze_tremor_suitability(csv_path):
     print(f"{'─'*70}")
 
     # Extract signal values
-    ax_values = [d['Ax'] for d in data]
-    ay_values = [d['Ay'] for d in data]
-    az_values = [d['Az'] for d in data]
-    gx_values = [d['Gx'] for d in data]
-    gy_values = [d['Gy'] for d in data]
-    gz_values = [d['Gz'] for d in data]
+    ax_values = data['Ax']
+    ay_values = data['Ay']
+    az_values = data['Az']
+    gx_values = data['Gx']
+    gy_values = data['Gy']
+    gz_values = data['Gz']
 
     ax_mean, ax_std, _, _ = calculate_stats(ax_values)
     ay_mean, ay_std, _, _ = calculate_stats(ay_values)
@@ -162,13 +191,13 @@ def analyze_tremor_suitability(csv_path):
     print(f"{'─'*70}")
 
     # Check for large gaps (>50ms could affect frequency analysis)
-    large_gaps = [dt for dt in intervals if dt > 50]
+    large_gaps = intervals[intervals > 50]
     percent_large_gaps = (len(large_gaps) / len(intervals)) * 100
 
     print(f"  Large gaps (>50ms): {len(large_gaps)} ({percent_large_gaps:.2f}%)")
 
     if len(large_gaps) > 0:
-        print(f"  Largest gap: {max(large_gaps):.0f} ms")
+        print(f"  Largest gap: {large_gaps.max():.0f} ms")
         print(f"  Impact: {'Minimal' if percent_large_gaps < 1 else 'Moderate'}")
 
     # Missing samples estimate
@@ -261,6 +290,13 @@ def analyze_tremor_suitability(csv_path):
 
     return suitability
 
+def assess_file(csv_path):
+    """Assess one file in a worker process, returning (report text, suitability)"""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        suitability = analyze_tremor_suitability(csv_path)
+    return report.getvalue(), suitability
+
 def main():
     csv_files = [
         '/home/user/Proceesing-data-based-RPI4/tremor_cycle1_20260121_141523.csv',
@@ -271,9 +307,13 @@ def main():
     print("TREMOR ANALYSIS SUITABILITY ASSESSMENT")
     print("="*70)
 
+    # Files are independent and CPU-bound: assess them in parallel processes,
+    # then print the captured reports in the original order
     results = {}
-    for csv_file in csv_files:
-        results[csv_file] = analyze_tremor_suitability(csv_file)
+    with ProcessPoolExecutor(max_workers=min(len(csv_files), os.cpu_count() or 1)) as ex:
+        for csv_file, (report, suitability) in zip(csv_files, ex.map(assess_file, csv_files)):
+            print(report, end='')
+            results[csv_file] = suitability
 
     # Summary
     print("\n" + "="*70)
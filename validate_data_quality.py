@@ -6,8 +6,14 @@ Per README protocol - validates tremor data CSV files
 
 import sys
 import os
-from datetime import datetime
-from collections import Counter
+import io
+import itertools
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
+import numpy as np
 
 # Configuration per README
 EXPECTED_COLUMNS = 7
@@ -18,11 +24,44 @@ MAX_STUCK_COUNT = 15  # Freeze detection threshold
 STUCK_THRESHOLD = 0.001  # m/s² threshold for detecting frozen sensor
 EXPECTED_DURATION_S = 120  # Expected recording duration
 EXPECTED_SAMPLES = EXPECTED_DURATION_S * EXPECTED_SAMPLE_RATE_HZ  # 12,000
+METADATA_KEYS = {'# Cycle': 'cycle', '# Start Time': 'start_time', '# Sample Rate': 'sample_rate'}  # Header comment -> metadata
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB reads: far fewer syscalls on the Pi's SD card
+ROW_CAPACITY = EXPECTED_SAMPLES + 1024  # Preallocated rows for the line-by-line parse
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'tremor_validate')  # Results of unchanged files
+CACHE_VERSION = 2  # Bump when the checks change so old cached results are ignored
+CACHED_FIELDS = ('errors', 'warnings', 'info', 'metadata', 'total_samples', 'invalid_lines',
+                 'validation_errors', 'timestamp_gaps', 'freeze_events')  # Validation results only
+
+# Data row layout (Timestamp in ms) for the bulk parse
+DATA_DTYPE = np.dtype([('Timestamp', np.int64), ('Ax', np.float64), ('Ay', np.float64), ('Az', np.float64),
+                       ('Gx', np.float64), ('Gy', np.float64), ('Gz', np.float64)])
+CSV_HEADER = ','.join(DATA_DTYPE.names)
+TIMESTAMP_MAX = np.iinfo(np.int64).max
+
+def window_reduce(func, a, width):
+    """Apply np.fmax/np.fmin over every width-sample window along the last axis
+
+    Windows are built by doubling (1, 2, 4, 8, then the remainder, overlap
+    is harmless for max/min), so the cost is O(n log width). fmax/fmin skip
+    NaN, which the per-sample comparisons never counted as a change either.
+    """
+    span = 1
+    while span * 2 <= width:
+        a = func(a[..., :-span], a[..., span:])
+        span *= 2
+    if span < width:
+        a = func(a[..., :span - width], a[..., width - span:])
+    return a
+
+def empty_columns():
+    """Column arrays of a data block without any valid rows"""
+    return [np.empty(0, dtype=DATA_DTYPE[i]) for i in range(len(DATA_DTYPE))]
 
 class DataValidator:
     def __init__(self, csv_path):
         self.csv_path = csv_path
         self.filename = os.path.basename(csv_path)
+        self.file_size = 0
         self.errors = []
         self.warnings = []
         self.info = []
@@ -47,29 +86,37 @@ class DataValidator:
     def parse_metadata(self, lines):
         """Extract metadata from CSV header"""
         for line in lines:
-            if line.startswith('# Cycle:'):
-                self.metadata['cycle'] = line.split(':')[1].strip()
-            elif line.startswith('# Start Time:'):
-                self.metadata['start_time'] = line.split(':', 1)[1].strip()
-            elif line.startswith('# Sample Rate:'):
-                rate = line.split(':')[1].strip()
-                self.metadata['sample_rate'] = rate
-                if '100 Hz' not in rate:
-                    self.log_warning(f"Sample rate is {rate}, expected 100 Hz")
+            # '# Name: value' -> one dict lookup on '# Name'
+            name, sep, value = line.partition(':')
+            key = METADATA_KEYS.get(name) if sep else None
+            if key is None:
+                continue
+
+            value = value.strip()
+            self.metadata[key] = value
+            if key == 'sample_rate' and '100 Hz' not in value:
+                self.log_warning(f"Sample rate is {value}, expected 100 Hz")
 
     def validate_data_line(self, line, line_num):
-        """Validate a single CSV data line per README protocol"""
-        parts = line.strip().split(',')
+        """Validate a single CSV data line per README protocol
+
+        Takes an already stripped line. Returns (True, parsed row) or
+        (False, error message).
+        """
+        parts = line.split(',')
 
         # Check column count
-        if len(parts) != EXPECTED_COLUMNS:
-            return False, f"Line {line_num}: Expected {EXPECTED_COLUMNS} columns, got {len(parts)}"
+        n_parts = len(parts)
+        if n_parts != EXPECTED_COLUMNS:
+            return False, f"Line {line_num}: Expected {EXPECTED_COLUMNS} columns, got {n_parts}"
 
         # Validate timestamp (must be positive integer)
         try:
             timestamp = int(parts[0])
             if timestamp < 0:
                 return False, f"Line {line_num}: Timestamp must be positive, got {timestamp}"
+            if timestamp > TIMESTAMP_MAX:
+                return False, f"Line {line_num}: Timestamp out of range, got {timestamp}"
         except ValueError:
             return False, f"Line {line_num}: Timestamp must be integer, got '{parts[0]}'"
 
@@ -80,113 +127,83 @@ class DataValidator:
         except ValueError as e:
             return False, f"Line {line_num}: Non-numeric sensor value - {e}"
 
-        return True, None
+        return True, (timestamp, ax, ay, az, gx, gy, gz)
 
-    def detect_sensor_freeze(self, data):
-        """Detect sensor freeze: 15 consecutive identical readings"""
-        if len(data) < MAX_STUCK_COUNT:
-            return
+    def parse_data_fast(self, lines):
+        """Bulk-parse the data rows with NumPy's C reader
 
-        for i in range(len(data) - MAX_STUCK_COUNT + 1):
-            # Check if next 15 samples are identical (within threshold)
-            is_stuck = True
-            base_ax, base_ay, base_az = data[i][1:4]
-
-            for j in range(1, MAX_STUCK_COUNT):
-                ax, ay, az = data[i+j][1:4]
-                if (abs(ax - base_ax) > STUCK_THRESHOLD or
-                    abs(ay - base_ay) > STUCK_THRESHOLD or
-                    abs(az - base_az) > STUCK_THRESHOLD):
-                    is_stuck = False
-                    break
-
-            if is_stuck:
-                timestamp = data[i][0]
-                self.freeze_events.append({
-                    'timestamp_ms': timestamp,
-                    'sample_index': i,
-                    'values': (base_ax, base_ay, base_az)
-                })
-                self.log_error(f"SENSOR FREEZE detected at {timestamp}ms: {MAX_STUCK_COUNT} consecutive identical readings")
-
-    def check_timestamp_consistency(self, data):
-        """Check for consistent 10ms intervals between samples"""
-        intervals = []
-        large_gaps = []
-
-        for i in range(1, len(data)):
-            interval = data[i][0] - data[i-1][0]
-            intervals.append(interval)
-
-            # Flag large gaps (more than tolerance)
-            if abs(interval - EXPECTED_INTERVAL_MS) > INTERVAL_TOLERANCE_MS:
-                large_gaps.append({
-                    'sample': i,
-                    'timestamp': data[i][0],
-                    'interval_ms': interval,
-                    'expected_ms': EXPECTED_INTERVAL_MS
-                })
-
-        if intervals:
-            mean_interval = sum(intervals) / len(intervals)
-            min_interval = min(intervals)
-            max_interval = max(intervals)
-
-            self.log_info(f"Timestamp intervals: mean={mean_interval:.2f}ms, min={min_interval}ms, max={max_interval}ms (expected={EXPECTED_INTERVAL_MS}ms)")
-
-            # Check if mean is within tolerance
-            if abs(mean_interval - EXPECTED_INTERVAL_MS) > INTERVAL_TOLERANCE_MS:
-                self.log_error(f"Mean interval {mean_interval:.2f}ms exceeds tolerance (expected {EXPECTED_INTERVAL_MS}±{INTERVAL_TOLERANCE_MS}ms)")
-
-            # Report large gaps
-            if large_gaps:
-                self.log_warning(f"Found {len(large_gaps)} timestamp intervals outside tolerance")
-                self.timestamp_gaps = large_gaps[:10]  # Keep first 10 for reporting
+        Returns one array per column (Timestamp, Ax, Ay, Az, Gx, Gy, Gz), or
+        None when any line needs the per-line path (its error is reported by
+        line number there).
+        """
+        # Whole-line comments are dropped here, so with comments=None a '#'
+        # inside a row fails the parse instead of silently cutting the row
+        rows = (line for line in lines if not line.startswith('#'))
+        first = next(rows, None)
+        if first is None:
+            return empty_columns()
 
-    def validate(self):
-        """Main validation function per README protocol"""
-        print(f"\n{'='*70}")
-        print(f"VALIDATING: {self.filename}")
-        print(f"{'='*70}\n")
+        # Strict int64/float64 fields: anything int()/float() reject fails here too
+        try:
+            columns = np.loadtxt(itertools.chain([first], rows), delimiter=',', dtype=DATA_DTYPE,
+                                 comments=None, ndmin=1, unpack=True)
+        except ValueError:
+            return None
 
-        if not os.path.exists(self.csv_path):
-            self.log_error(f"File not found: {self.csv_path}")
-            return False
+        if (columns[0] < 0).any():
+            return None
 
-        # Read file
-        try:
-            with open(self.csv_path, 'r') as f:
-                lines = f.readlines()
-        except Exception as e:
-            self.log_error(f"Failed to read file: {e}")
-            return False
+        return columns
 
-        # Parse metadata
-        header_lines = [l for l in lines if l.startswith('#')]
-        self.parse_metadata(header_lines)
+    def read_data(self, f):
+        """Read metadata, CSV header and data rows from the open file
 
-        # Find CSV header
+        Streams the file: the header is read line by line, the data rows go
+        straight to the bulk parser, and only a file with invalid rows is
+        re-read from the data start for the per-line path. Returns the valid
+        rows as one array per column, or None when there is no CSV header.
+        """
+        # Metadata comment lines, up to the CSV header
+        header_lines = []
         csv_header_idx = None
-        for i, line in enumerate(lines):
+        for i, line in enumerate(iter(f.readline, '')):
             if line.startswith('Timestamp,'):
                 csv_header_idx = i
                 break
+            if line.startswith('#'):
+                header_lines.append(line)
+
+        self.parse_metadata(header_lines)
 
         if csv_header_idx is None:
             self.log_error("No CSV header found (expected 'Timestamp,Ax,Ay,Az,Gx,Gy,Gz')")
-            return False
+            return None
 
         # Validate header format
-        expected_header = "Timestamp,Ax,Ay,Az,Gx,Gy,Gz"
-        actual_header = lines[csv_header_idx].strip()
-        if actual_header != expected_header:
-            self.log_error(f"Invalid CSV header: got '{actual_header}', expected '{expected_header}'")
-
-        # Process data lines
-        data_lines = lines[csv_header_idx + 1:]
-        valid_data = []
-
-        for i, line in enumerate(data_lines, start=csv_header_idx + 2):
+        actual_header = line.strip()
+        if actual_header != CSV_HEADER:
+            self.log_error(f"Invalid CSV header: got '{actual_header}', expected '{CSV_HEADER}'")
+
+        # Process data lines: one bulk parse when every line is valid,
+        # otherwise line by line to report each invalid one
+        data_start = f.tell()
+        columns = self.parse_data_fast(f)
+        if columns is None:
+            f.seek(data_start)
+            columns = self.parse_data_lines(f, csv_header_idx + 2)
+
+        self.total_samples = len(columns[0])
+        return columns
+
+    def parse_data_lines(self, data_lines, first_line_num):
+        """Validate and parse the data block line by line (one array per column)"""
+        valid_data = np.empty(ROW_CAPACITY, dtype=DATA_DTYPE)
+        capacity = ROW_CAPACITY
+        n_valid = 0
+        validate_line = self.validate_data_line  # Bound once, not per line
+        log_invalid = self.validation_errors.append
+
+        for i, line in enumerate(data_lines, start=first_line_num):
             line = line.strip()
             if not line or line.startswith('#'):
                 continue
@@ -194,28 +211,126 @@ class DataValidator:
             # Check for invalid data markers
             if line.startswith('# INVALID:'):
                 self.invalid_lines += 1
-                self.validation_errors.append(f"Line {i}: Marked as invalid - {line}")
+                log_invalid(f"Line {i}: Marked as invalid - {line}")
                 continue
 
-            # Validate data line
-            is_valid, error_msg = self.validate_data_line(line, i)
+            # Validate data line (parsed once: a valid line comes back as its row)
+            is_valid, result = validate_line(line, i)
 
             if not is_valid:
                 self.invalid_lines += 1
-                self.validation_errors.append(error_msg)
+                log_invalid(result)
                 continue
 
-            # Parse valid data
-            parts = line.split(',')
-            timestamp = int(parts[0])
-            ax, ay, az = float(parts[1]), float(parts[2]), float(parts[3])
-            gx, gy, gz = float(parts[4]), float(parts[5]), float(parts[6])
+            if n_valid == capacity:
+                valid_data = np.concatenate((valid_data, np.empty_like(valid_data)))
+                capacity *= 2
+            valid_data[n_valid] = result
+            n_valid += 1
+
+        valid_data = valid_data[:n_valid]
+        return [valid_data[name].copy() for name in DATA_DTYPE.names]
 
-            valid_data.append([timestamp, ax, ay, az, gx, gy, gz])
-            self.total_samples += 1
+    def detect_sensor_freeze(self, timestamps, accel):
+        """Detect sensor freeze: 15 consecutive identical readings
+
+        accel holds the Ax/Ay/Az rows. A window is stuck when, on all three
+        axes, its max and min stay within STUCK_THRESHOLD of its first sample.
+        """
+        if accel.shape[-1] < MAX_STUCK_COUNT:
+            return
+
+        base = accel[:, :accel.shape[-1] - MAX_STUCK_COUNT + 1]
+        with np.errstate(invalid='ignore'):  # inf - inf: NaN, not a change
+            moved = ((window_reduce(np.fmax, accel, MAX_STUCK_COUNT) - base > STUCK_THRESHOLD) |
+                     (base - window_reduce(np.fmin, accel, MAX_STUCK_COUNT) > STUCK_THRESHOLD)).any(axis=0)
+
+        for i in np.flatnonzero(~moved).tolist():
+            timestamp = int(timestamps[i])
+            self.freeze_events.append({
+                'timestamp_ms': timestamp,
+                'sample_index': i,
+                'values': tuple(accel[:, i].tolist())
+            })
+            self.log_error(f"SENSOR FREEZE detected at {timestamp}ms: {MAX_STUCK_COUNT} consecutive identical readings")
+
+    def check_timestamp_consistency(self, timestamps):
+        """Check for consistent 10ms intervals between samples"""
+        intervals = np.diff(timestamps)
+        if intervals.size == 0:
+            return
+
+        mean_interval = intervals.sum() / intervals.size
+        min_interval = intervals.min()
+        max_interval = intervals.max()
+
+        self.log_info(f"Timestamp intervals: mean={mean_interval:.2f}ms, min={min_interval}ms, max={max_interval}ms (expected={EXPECTED_INTERVAL_MS}ms)")
+
+        # Check if mean is within tolerance
+        if abs(mean_interval - EXPECTED_INTERVAL_MS) > INTERVAL_TOLERANCE_MS:
+            self.log_error(f"Mean interval {mean_interval:.2f}ms exceeds tolerance (expected {EXPECTED_INTERVAL_MS}±{INTERVAL_TOLERANCE_MS}ms)")
+
+        # Flag large gaps (more than tolerance)
+        gap_idx = np.flatnonzero(np.abs(intervals - EXPECTED_INTERVAL_MS) > INTERVAL_TOLERANCE_MS)
+
+        # Report large gaps
+        if gap_idx.size:
+            self.log_warning(f"Found {gap_idx.size} timestamp intervals outside tolerance")
+            self.timestamp_gaps = [{  # Keep first 10 for reporting
+                'sample': i + 1,
+                'timestamp': int(timestamps[i + 1]),
+                'interval_ms': int(intervals[i]),
+                'expected_ms': EXPECTED_INTERVAL_MS
+            } for i in gap_idx[:10].tolist()]
+
+    def validate(self):
+        """Main validation function per README protocol"""
+        print(f"\n{'='*70}")
+        print(f"VALIDATING: {self.filename}")
+        print(f"{'='*70}\n")
+
+        # One stat both checks the file and gives its size and cache key
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            self.log_error(f"File not found: {self.csv_path}")
+            return False
+        self.file_size = st.st_size
+
+        # An unchanged file (same path, mtime and size) reuses its last result
+        cache_file = self.cache_file(st)
+        if not self.load_cache(cache_file):
+            if not self.validate_csv():
+                return False
+            self.save_cache(cache_file)
+
+        # Check for corresponding log file
+        log_path = self.csv_path.replace('.csv', '.log')
+        if not os.path.exists(log_path):
+            self.log_warning(f"No corresponding log file found: {os.path.basename(log_path)}")
+
+        return True
+
+    def validate_csv(self):
+        """Parse the CSV and run the sample count, timestamp and freeze checks"""
+        if self.file_size == 0:
+            self.log_error("No CSV header found (expected 'Timestamp,Ax,Ay,Az,Gx,Gy,Gz')")
+            return False
+
+        # Read file
+        try:
+            with open(self.csv_path, 'r', buffering=READ_BUFFER_SIZE, encoding='utf-8') as f:
+                columns = self.read_data(f)
+        except (OSError, UnicodeDecodeError) as e:
+            self.log_error(f"Failed to read file: {e}")
+            return False
+
+        if columns is None:
+            return False
 
         # Check sample count
-        duration_s = valid_data[-1][0] / 1000.0 if valid_data else 0
+        timestamps = columns[0]
+        duration_s = timestamps[-1] / 1000.0 if self.total_samples else 0
         self.log_info(f"Total valid samples: {self.total_samples}")
         self.log_info(f"Recording duration: {duration_s:.1f}s (expected: {EXPECTED_DURATION_S}s)")
 
@@ -225,105 +340,154 @@ class DataValidator:
             self.log_warning(f"Sample count {self.total_samples} differs from expected {EXPECTED_SAMPLES}")
 
         # Check timestamp consistency
-        if valid_data:
-            self.check_timestamp_consistency(valid_data)
+        if self.total_samples:
+            self.check_timestamp_consistency(timestamps)
 
-        # Detect sensor freeze
-        if valid_data:
-            self.detect_sensor_freeze(valid_data)
+        # Detect sensor freeze (Ax/Ay/Az rows)
+        if self.total_samples:
+            self.detect_sensor_freeze(timestamps, np.stack(columns[1:4]))
 
-        # Check for corresponding log file
-        log_path = self.csv_path.replace('.csv', '.log')
-        if not os.path.exists(log_path):
-            self.log_warning(f"No corresponding log file found: {os.path.basename(log_path)}")
+        return True
+
+    def cache_file(self, st):
+        """Cache path for this CSV's (path, mtime, size) fingerprint"""
+        key = repr((CACHE_VERSION, os.path.abspath(self.csv_path), st.st_mtime_ns, st.st_size))
+        return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.pkl')
+
+    def load_cache(self, cache_file):
+        """Restore a cached validation result, True on a hit
 
+        Any failure to read a corrupt or outdated entry is a miss.
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            results = {field: cached[field] for field in CACHED_FIELDS}
+        except Exception:
+            return False
+        self.__dict__.update(results)
         return True
 
+    def save_cache(self, cache_file):
+        """Store the validation result; the cache is best effort"""
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({field: getattr(self, field) for field in CACHED_FIELDS}, f,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)  # Atomic: parallel workers never see half a file
+        except OSError:
+            pass
+
     def print_report(self):
-        """Print validation report"""
-        print("\n" + "─"*70)
-        print("METADATA")
-        print("─"*70)
+        """Print validation report (buffered, written to stdout in one call)"""
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+        out("\n" + "─"*70)
+        out("METADATA")
+        out("─"*70)
         if self.metadata:
             for key, value in self.metadata.items():
-                print(f"  {key.replace('_', ' ').title()}: {value}")
+                out(f"  {key.replace('_', ' ').title()}: {value}")
         else:
-            print("  No metadata found")
-
-        print("\n" + "─"*70)
-        print("VALIDATION SUMMARY")
-        print("─"*70)
-        print(f"  Total Valid Samples: {self.total_samples}")
-        print(f"  Invalid Lines: {self.invalid_lines}")
-        print(f"  Validation Errors: {len(self.validation_errors)}")
-        print(f"  Sensor Freeze Events: {len(self.freeze_events)}")
-        print(f"  Timestamp Gaps: {len(self.timestamp_gaps)}")
-
-        print("\n" + "─"*70)
-        print("INFO MESSAGES")
-        print("─"*70)
+            out("  No metadata found")
+
+        out("\n" + "─"*70)
+        out("VALIDATION SUMMARY")
+        out("─"*70)
+        out(f"  Total Valid Samples: {self.total_samples}")
+        out(f"  Invalid Lines: {self.invalid_lines}")
+        out(f"  Validation Errors: {len(self.validation_errors)}")
+        out(f"  Sensor Freeze Events: {len(self.freeze_events)}")
+        out(f"  Timestamp Gaps: {len(self.timestamp_gaps)}")
+
+        out("\n" + "─"*70)
+        out("INFO MESSAGES")
+        out("─"*70)
         if self.info:
             for msg in self.info:
-                print(f"  ℹ️  {msg}")
+                out(f"  ℹ️  {msg}")
         else:
-            print("  None")
+            out("  None")
 
-        print("\n" + "─"*70)
-        print("WARNINGS")
-        print("─"*70)
+        out("\n" + "─"*70)
+        out("WARNINGS")
+        out("─"*70)
         if self.warnings:
             for msg in self.warnings:
-                print(f"  ⚠️  {msg}")
+                out(f"  ⚠️  {msg}")
         else:
-            print("  ✅ No warnings")
+            out("  ✅ No warnings")
 
-        print("\n" + "─"*70)
-        print("ERRORS")
-        print("─"*70)
+        out("\n" + "─"*70)
+        out("ERRORS")
+        out("─"*70)
         if self.errors:
             for msg in self.errors:
-                print(f"  ❌ {msg}")
+                out(f"  ❌ {msg}")
         else:
-            print("  ✅ No errors")
+            out("  ✅ No errors")
 
         # Show validation errors (first 5)
         if self.validation_errors:
-            print("\n" + "─"*70)
-            print("VALIDATION ERRORS (First 5)")
-            print("─"*70)
+            out("\n" + "─"*70)
+            out("VALIDATION ERRORS (First 5)")
+            out("─"*70)
             for err in self.validation_errors[:5]:
-                print(f"  {err}")
+                out(f"  {err}")
             if len(self.validation_errors) > 5:
-                print(f"  ... and {len(self.validation_errors) - 5} more")
+                out(f"  ... and {len(self.validation_errors) - 5} more")
 
         # Show timestamp gaps (first 5)
         if self.timestamp_gaps:
-            print("\n" + "─"*70)
-            print("LARGE TIMESTAMP GAPS (First 5)")
-            print("─"*70)
+            out("\n" + "─"*70)
+            out("LARGE TIMESTAMP GAPS (First 5)")
+            out("─"*70)
             for gap in self.timestamp_gaps[:5]:
-                print(f"  Sample {gap['sample']} at {gap['timestamp']}ms: interval={gap['interval_ms']}ms (expected={gap['expected_ms']}ms)")
+                out(f"  Sample {gap['sample']} at {gap['timestamp']}ms: interval={gap['interval_ms']}ms (expected={gap['expected_ms']}ms)")
 
         # Show freeze events
         if self.freeze_events:
-            print("\n" + "─"*70)
-            print("SENSOR FREEZE EVENTS")
-            print("─"*70)
+            out("\n" + "─"*70)
+            out("SENSOR FREEZE EVENTS")
+            out("─"*70)
             for event in self.freeze_events:
-                print(f"  At {event['timestamp_ms']}ms (sample {event['sample_index']}): Ax,Ay,Az = {event['values']}")
+                out(f"  At {event['timestamp_ms']}ms (sample {event['sample_index']}): Ax,Ay,Az = {event['values']}")
 
-        print("\n" + "─"*70)
-        print("OVERALL STATUS")
-        print("─"*70)
+        out("\n" + "─"*70)
+        out("OVERALL STATUS")
+        out("─"*70)
 
         if not self.errors and not self.validation_errors and not self.freeze_events:
-            print("  ✅ PASS - Data quality is excellent")
+            out("  ✅ PASS - Data quality is excellent")
         elif not self.errors and not self.validation_errors:
-            print("  ⚠️  PASS with warnings - Check warnings above")
+            out("  ⚠️  PASS with warnings - Check warnings above")
         else:
-            print("  ❌ FAIL - Critical errors found")
+            out("  ❌ FAIL - Critical errors found")
+
+        out("="*70 + "\n")
+        sys.stdout.write(buf.getvalue())
+
+
+def validate_file(csv_path):
+    """Validate one file in a worker process, returning (report text, counts)
 
-        print("="*70 + "\n")
+    Only the counts for the overall summary go back to the parent, not the
+    validator with its error, gap and freeze lists.
+    """
+    report = io.StringIO()
+    with redirect_stdout(report):
+        validator = DataValidator(csv_path)
+        validator.validate()
+        validator.print_report()
+    counts = {
+        'samples': validator.total_samples,
+        'errors': len(validator.errors) + len(validator.validation_errors),
+        'warnings': len(validator.warnings),
+        'freezes': len(validator.freeze_events),
+    }
+    return report.getvalue(), counts
 
 
 def main():
@@ -350,32 +514,31 @@ def main():
 
     # Validate each file
     all_passed = True
-    validators = []
+    files_validated = 0
+    totals = {'samples': 0, 'errors': 0, 'warnings': 0, 'freezes': 0}
 
-    for csv_file in csv_files:
-        validator = DataValidator(csv_file)
-        validator.validate()
-        validator.print_report()
-        validators.append(validator)
+    # Files are independent: validate them in parallel processes, then print
+    # the captured reports in the original order, keeping only running totals
+    with ProcessPoolExecutor(max_workers=min(len(csv_files), os.cpu_count() or 1)) as ex:
+        for report, counts in ex.map(validate_file, csv_files):
+            print(report, end='')
+            files_validated += 1
+            for key, value in counts.items():
+                totals[key] += value
 
-        if validator.errors or validator.validation_errors or validator.freeze_events:
-            all_passed = False
+            if counts['errors'] or counts['freezes']:
+                all_passed = False
 
     # Overall summary
     print("\n" + "="*70)
     print("OVERALL VALIDATION SUMMARY")
     print("="*70)
 
-    total_samples = sum(v.total_samples for v in validators)
-    total_errors = sum(len(v.errors) + len(v.validation_errors) for v in validators)
-    total_warnings = sum(len(v.warnings) for v in validators)
-    total_freezes = sum(len(v.freeze_events) for v in validators)
-
-    print(f"  Files validated: {len(validators)}")
-    print(f"  Total samples: {total_samples}")
-    print(f"  Total errors: {total_errors}")
-    print(f"  Total warnings: {total_warnings}")
-    print(f"  Total freeze events: {total_freezes}")
+    print(f"  Files validated: {files_validated}")
+    print(f"  Total samples: {totals['samples']}")
+    print(f"  Total errors: {totals['errors']}")
+    print(f"  Total warnings: {totals['warnings']}")
+    print(f"  Total freeze events: {totals['freezes']}")
 
     if all_passed:
         print("\n  ✅ ALL FILES PASSED VALIDATION")